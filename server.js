@@ -311,27 +311,69 @@ const serveStatic = (req, res, urlObj) => {
           send(res, 404, 'Not Found');
           return;
         }
-        streamFile(indexPath, req, res);
+        streamFile(indexPath, req, res, indexStats.size);
       });
       return;
     }
-    streamFile(filePath, req, res);
+    streamFile(filePath, req, res, stats.size);
   });
 };
 
-const streamFile = (filePath, req, res) => {
+const parseByteRange = (header, size) => {
+  const match = /^bytes=(\d*)-(\d*)$/.exec((header || '').trim());
+  if (!match || (!match[1] && !match[2])) {
+    return null;
+  }
+  let start;
+  let end;
+  if (!match[1]) {
+    const suffix = Number(match[2]);
+    if (!suffix) {
+      return false;
+    }
+    start = Math.max(0, size - suffix);
+    end = size - 1;
+  } else {
+    start = Number(match[1]);
+    if (match[2] && Number(match[2]) < start) {
+      return null;
+    }
+    end = match[2] ? Math.min(Number(match[2]), size - 1) : size - 1;
+  }
+  if (start >= size) {
+    return false;
+  }
+  return { start, end };
+};
+
+const streamFile = (filePath, req, res, size) => {
   const ext = path.extname(filePath).toLowerCase();
   const mime = MIME_TYPES[ext] || 'application/octet-stream';
   const headers = { ...SECURITY_HEADERS, 'Content-Type': mime };
   if (ext === '.json') {
     headers['Cache-Control'] = 'no-store';
   }
-  res.writeHead(200, headers);
+  let range = null;
+  if (AUDIO_EXTENSIONS.has(ext)) {
+    headers['Accept-Ranges'] = 'bytes';
+    range = parseByteRange(req.headers.range, size);
+    if (range === false) {
+      send(res, 416, '', { ...headers, 'Content-Range': `bytes */${size}` });
+      return;
+    }
+    if (range) {
+      headers['Content-Range'] = `bytes ${range.start}-${range.end}/${size}`;
+      headers['Content-Length'] = range.end - range.start + 1;
+    } else {
+      headers['Content-Length'] = size;
+    }
+  }
+  res.writeHead(range ? 206 : 200, headers);
   if (req.method === 'HEAD') {
     res.end();
     return;
   }
-  const stream = fs.createReadStream(filePath);
+  const stream = fs.createReadStream(filePath, range ? { start: range.start, end: range.end } : undefined);
   stream.on('error', () => {
     if (!res.headersSent) {
       send(res, 500, 'Internal Server Error');
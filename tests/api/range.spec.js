@@ -0,0 +1,59 @@
+const { test, expect } = require('@playwright/test');
+const fs = require('fs');
+const path = require('path');
+
+const FIXTURE_NAME = 'range-spec-fixture.mp3';
+const FIXTURE_PATH = path.resolve(__dirname, '../../assets/audio', FIXTURE_NAME);
+const FIXTURE_URL = `/assets/audio/${FIXTURE_NAME}`;
+const FIXTURE = Buffer.from(Array.from({ length: 100 }, (_, index) => index));
+
+test.describe('Integration audio Range requests', () => {
+    test.beforeAll(async () => {
+        await fs.promises.writeFile(FIXTURE_PATH, FIXTURE);
+    });
+
+    test.afterAll(async () => {
+        try {
+            await fs.promises.unlink(FIXTURE_PATH);
+        } catch (error) {
+            if (error.code !== 'ENOENT') {
+                throw error;
+            }
+        }
+    });
+
+    test('full GET returns the whole file and advertises ranges', async ({ request }) => {
+        const response = await request.get(FIXTURE_URL);
+        expect(response.status()).toBe(200);
+        expect(response.headers()['accept-ranges']).toBe('bytes');
+        expect(response.headers()['content-length']).toBe(String(FIXTURE.length));
+        expect(Buffer.compare(await response.body(), FIXTURE)).toBe(0);
+    });
+
+    test('bounded range returns 206 with the requested bytes', async ({ request }) => {
+        const response = await request.get(FIXTURE_URL, { headers: { Range: 'bytes=0-9' } });
+        expect(response.status()).toBe(206);
+        expect(response.headers()['content-range']).toBe(`bytes 0-9/${FIXTURE.length}`);
+        expect(response.headers()['content-length']).toBe('10');
+        expect(Buffer.compare(await response.body(), FIXTURE.subarray(0, 10))).toBe(0);
+    });
+
+    test('suffix range returns the last bytes', async ({ request }) => {
+        const response = await request.get(FIXTURE_URL, { headers: { Range: 'bytes=-5' } });
+        expect(response.status()).toBe(206);
+        expect(response.headers()['content-range']).toBe(`bytes 95-99/${FIXTURE.length}`);
+        expect(Buffer.compare(await response.body(), FIXTURE.subarray(95))).toBe(0);
+    });
+
+    test('unsatisfiable range returns 416', async ({ request }) => {
+        const response = await request.get(FIXTURE_URL, { headers: { Range: `bytes=${FIXTURE.length}-` } });
+        expect(response.status()).toBe(416);
+        expect(response.headers()['content-range']).toBe(`bytes */${FIXTURE.length}`);
+    });
+
+    test('reversed range is ignored and serves the whole file', async ({ request }) => {
+        const response = await request.get(FIXTURE_URL, { headers: { Range: 'bytes=5-2' } });
+        expect(response.status()).toBe(200);
+        expect(Buffer.compare(await response.body(), FIXTURE)).toBe(0);
+    });
+});
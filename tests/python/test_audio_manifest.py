@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+
+import audio_manifest  # noqa: E402
+
+# MPEG 1 couche III, 128 kbps, 44,1 kHz, stereo : trames de 417 octets.
+MPEG1_STEREO = b"\xff\xfb\x90\x00"
+MPEG1_LENGTH = 417
+# MPEG 2 couche III, 64 kbps, 22,05 kHz, mono : trames de 208 octets.
+MPEG2_MONO = b"\xff\xf3\x80\xc0"
+MPEG2_LENGTH = 208
+
+
+def frame(header: bytes, length: int) -> bytes:
+    return header + bytes(length - len(header))
+
+
+def xing_frame(frames: int, tag: bytes = b"Xing", flags: int = 0x01) -> bytes:
+    side_info = 32  # MPEG 1 stereo
+    payload = bytes(side_info) + tag + flags.to_bytes(4, "big") + frames.to_bytes(4, "big")
+    return frame(MPEG1_STEREO + payload, MPEG1_LENGTH)
+
+
+def id3v2(payload_size: int) -> bytes:
+    size = bytes((payload_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + size + bytes(payload_size)
+
+
+class FrameHeaderTests(unittest.TestCase):
+    def test_parses_mpeg1_and_mpeg2_headers(self):
+        header = audio_manifest.parse_frame_header(MPEG1_STEREO, 0)
+        self.assertEqual((header["bitrate"], header["sampleRate"], header["channels"]), (128000, 44100, 2))
+        self.assertEqual((header["samples"], header["length"]), (1152, MPEG1_LENGTH))
+        header = audio_manifest.parse_frame_header(MPEG2_MONO, 0)
+        self.assertEqual((header["bitrate"], header["sampleRate"], header["channels"]), (64000, 22050, 1))
+        self.assertEqual((header["samples"], header["length"]), (576, MPEG2_LENGTH))
+
+    def test_rejects_reserved_values(self):
+        self.assertIsNone(audio_manifest.parse_frame_header(b"\xff\xfb\xf0\x00", 0))  # debit 15
+        self.assertIsNone(audio_manifest.parse_frame_header(b"\xff\xfb\x9c\x00", 0))  # frequence 3
+        self.assertIsNone(audio_manifest.parse_frame_header(b"\xff\xfb", 0))
+
+
+class ScanMp3Tests(unittest.TestCase):
+    def test_cbr_stream_is_walked_frame_by_frame(self):
+        data = frame(MPEG1_STEREO, MPEG1_LENGTH) * 20
+        result = audio_manifest.scan_mp3(data)
+        self.assertEqual(result["frames"], 20)
+        self.assertEqual(result["audioOffset"], 0)
+        self.assertEqual(result["duration"], round(20 * 1152 / 44100, 3))
+        self.assertEqual(result["bitrate"], 128)
+        self.assertFalse(result["vbr"])
+
+    def test_xing_header_gives_frame_count_and_skips_its_frame(self):
+        tag = id3v2(20)
+        data = tag + xing_frame(10) + frame(MPEG1_STEREO, MPEG1_LENGTH) * 10 + b"TAG" + bytes(125)
+        result = audio_manifest.scan_mp3(data)
+        self.assertEqual(result["frames"], 10)
+        self.assertEqual(result["audioOffset"], len(tag) + MPEG1_LENGTH)
+        self.assertEqual(result["duration"], round(10 * 1152 / 44100, 3))
+        self.assertEqual(result["bitrate"], 128)
+        self.assertTrue(result["vbr"])
+
+    def test_info_header_is_constant_bitrate(self):
+        data = xing_frame(5, b"Info") + frame(MPEG1_STEREO, MPEG1_LENGTH) * 5
+        result = audio_manifest.scan_mp3(data)
+        self.assertEqual((result["frames"], result["audioOffset"], result["vbr"]), (5, MPEG1_LENGTH, False))
+
+    def test_xing_header_without_frame_count_is_skipped_before_walking(self):
+        data = xing_frame(0, flags=0) + frame(MPEG1_STEREO, MPEG1_LENGTH) * 8
+        result = audio_manifest.scan_mp3(data)
+        self.assertEqual((result["frames"], result["audioOffset"]), (8, MPEG1_LENGTH))
+        self.assertEqual(result["duration"], round(8 * 1152 / 44100, 3))
+        self.assertFalse(result["vbr"])
+
+    def test_mpeg2_mono(self):
+        data = frame(MPEG2_MONO, MPEG2_LENGTH) * 10
+        result = audio_manifest.scan_mp3(data)
+        self.assertEqual((result["sampleRate"], result["channels"], result["frames"]), (22050, 1, 10))
+        self.assertEqual(result["duration"], round(10 * 576 / 22050, 3))
+        self.assertEqual(result["bitrate"], 64)
+
+    def test_no_frames(self):
+        self.assertIsNone(audio_manifest.scan_mp3(b"\xff\x00" * 100))
+
+
+class ScanTrackTests(unittest.TestCase):
+    def scan(self, name, content):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / name
+            path.write_bytes(content)
+            return audio_manifest.scan_track(path, audio_manifest.MAX_SIZE)
+
+    def test_reports_lfs_pointer_and_non_audio(self):
+        self.assertEqual(self.scan("a.mp3", audio_manifest.LFS_POINTER_PREFIX + b"v1\n")["issues"], ["lfs-pointer"])
+        self.assertEqual(self.scan("b.mp3", b"not an mp3")["issues"], ["non-audio"])
+        self.assertEqual(self.scan("c.txt", b"text")["issues"], ["non-audio"])
+
+    def test_records_metadata(self):
+        record = self.scan("d.mp3", frame(MPEG1_STEREO, MPEG1_LENGTH) * 3)
+        self.assertEqual((record["issues"], record["frames"]), ([], 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+
+import description_audit  # noqa: E402
+
+WALLS = (
+    "Les murs sont d'un gris sombre, presque noir, leur surface lisse et polie "
+    "par les vents hurlants qui soufflent sans relache sur la vallee."
+)
+
+
+class NormalizationTests(unittest.TestCase):
+    def test_strip_markdown_resolves_links_and_formatting(self):
+        text = "## Titre\n> **Gras** et [[Imossa|la cite]] vers [site](https://x.y)"
+        self.assertEqual(description_audit.strip_markdown(text), "Titre Gras et la cite vers site")
+
+    def test_split_into_sentences_drops_short_fragments(self):
+        text = "Court. Une phrase suffisamment longue pour etre conservee ici; et un reste trop court."
+        self.assertEqual(
+            description_audit.split_into_sentences(text),
+            ["Une phrase suffisamment longue pour etre conservee ici"],
+        )
+
+    def test_passage_field_keeps_json_list_index(self):
+        passages = description_audit.collect_passages({"Nord": [{"name": "Aguilar", "lore": ["", None, WALLS], "history": WALLS}]})
+        self.assertEqual([passage["field"] for passage in passages], ["history", "lore[2]"])
+
+    def test_sentence_key_ignores_accents_and_punctuation(self):
+        self.assertEqual(description_audit.normalize_sentence_key("Élevée, au Cœur!"), "elevee au c ur")
+
+
+class ClusterTests(unittest.TestCase):
+    def dataset(self):
+        return {
+            "Vruliwen": [
+                {"name": "Aguilar", "lore": [WALLS]},
+                {"name": "Imossa", "description": "Une cite insulaire unique, isolee au coeur du continent."},
+            ],
+            "Zemantis": [
+                {"name": "Camp O.E", "history": [WALLS.replace("gris sombre", "gris clair")]},
+                {"name": "Barolt", "description": "Barolt est un lieu de type Village situe sur Zemantis."},
+                {"name": "Kitha", "description": "Kitha est un lieu de type Village situe sur Zemantis."},
+            ],
+        }
+
+    def test_groups_near_duplicates_across_locations(self):
+        passages = description_audit.collect_passages(self.dataset())
+        signatures, computed = description_audit.compute_signatures(passages, {})
+        self.assertEqual(computed, len(signatures))
+        clusters = description_audit.find_clusters(passages, signatures, 0.6)
+
+        members = [sorted(member["name"] for member in cluster["members"]) for cluster in clusters]
+        self.assertIn(["Aguilar", "Camp O.E"], members)
+        self.assertNotIn("Imossa", {name for group in members for name in group})
+        fallback = [cluster for cluster in clusters if cluster["fallback"]]
+        self.assertEqual(len(fallback), 1)
+        self.assertEqual(sorted(member["name"] for member in fallback[0]["members"]), ["Barolt", "Kitha"])
+
+    def test_cache_skips_known_signatures(self):
+        passages = description_audit.collect_passages(self.dataset())
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = Path(directory) / "cache.json"
+            signatures, _ = description_audit.compute_signatures(passages, {})
+            description_audit.save_cache(cache_path, signatures)
+            _, computed = description_audit.compute_signatures(passages, description_audit.load_cache(cache_path))
+        self.assertEqual(computed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+
+import prerender_markdown  # noqa: E402
+
+
+class RenderMarkdownTests(unittest.TestCase):
+    def test_port_matches_unit_cases(self):
+        for source, expected in prerender_markdown.load_unit_cases():
+            with self.subTest(source=source):
+                self.assertEqual(prerender_markdown.render_markdown(source), expected)
+
+    def test_whitespace_only_renders_empty(self):
+        self.assertEqual(prerender_markdown.render_markdown(" \u00a0\n\u3000"), "")
+
+
+class WikiLinkTests(unittest.TestCase):
+    def setUp(self):
+        self.resolver = prerender_markdown.WikiLinkResolver(["Imossa", "Val d'Écume"])
+
+    def test_rewrites_to_canonical_name(self):
+        self.assertEqual(self.resolver.rewrite("Vers [[imossa]]."), "Vers [[imossa|Imossa]].")
+        self.assertEqual(self.resolver.rewrite("[[la vallee|VAL D'ECUME]]"), "[[la vallee|Val d'Écume]]")
+
+    def test_keeps_exact_and_unknown_links(self):
+        self.assertEqual(self.resolver.rewrite("[[Imossa]] et [[Nulle part]]"), "[[Imossa]] et [[Nulle part]]")
+        self.assertEqual(self.resolver.unresolved, {"Nulle part": 1})
+
+    def test_ignores_inline_code(self):
+        self.assertEqual(self.resolver.rewrite("`[[imossa]]` [[imossa]]"), "`[[imossa]]` [[imossa|Imossa]]")
+
+    def test_code_spans_do_not_pair_across_blocks(self):
+        text = "Prix : 5` pieces.\n\nVoir [[imossa]].\n\n- Puis `x` et [[imossa]]"
+        rewritten = self.resolver.rewrite(text)
+        self.assertEqual(rewritten, "Prix : 5` pieces.\n\nVoir [[imossa|Imossa]].\n\n- Puis `x` et [[imossa|Imossa]]")
+        self.assertEqual(prerender_markdown.render_markdown(rewritten).count('data-location="Imossa"'), 2)
+
+    def test_ignores_fenced_code_blocks(self):
+        text = "```\n[[imossa]]\n```\n[[imossa]]"
+        self.assertEqual(self.resolver.rewrite(text), "```\n[[imossa]]\n```\n[[imossa|Imossa]]")
+
+
+class SidecarTests(unittest.TestCase):
+    def setUp(self):
+        self.renderer = prerender_markdown.FragmentRenderer(prerender_markdown.WikiLinkResolver(["Imossa"]), {})
+
+    def test_render_field_keeps_list_indexes_like_render_section(self):
+        self.assertEqual(self.renderer.render_field(["*a*", "", "   ", None, 3, "b"]), ["<p><em>a</em></p>", "", None, "<p>b</p>"])
+
+    def test_build_sidecars_writes_locations_only(self):
+        locations = {"Nord": [{"name": "Imossa", "description": "**Cite**", "lore": ["x", " "]}, {"name": "Vide"}]}
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp)
+            (output / "timeline.json").write_text("{}", encoding="utf-8")
+            stats = prerender_markdown.build_sidecars(locations, self.renderer, output)
+            index = json.loads((output / "index.json").read_text(encoding="utf-8"))
+            sidecar = json.loads((output / index["locations"]["Imossa"]).read_text(encoding="utf-8"))
+
+        self.assertEqual(stats["locations"], 1)
+        self.assertEqual(list(index["locations"]), ["Imossa"])
+        self.assertNotIn("timeline", index)
+        self.assertEqual(sidecar["description"], "<p><strong>Cite</strong></p>")
+        self.assertEqual(sidecar["lore"], ["<p>x</p>", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()
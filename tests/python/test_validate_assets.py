@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+TOOLS_DIR = Path(__file__).resolve().parents[2] / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+import validate_assets  # noqa: E402
+
+
+class CrossReferenceTests(unittest.TestCase):
+    def test_reports_unknown_references(self):
+        issues, _ = validate_assets.validate_cross_references({
+            "locations": {"Vruliwen": [{"name": "Imossa"}]},
+            "timeline": {"entries": [{"id": "e", "locationNames": ["imossa", "Vruliwen", "Nulle part"]}]},
+            "users": [{"id": "u1", "groups": ["g1", "g2"]}],
+            "groups": [{"id": "g1", "name": "G", "members": ["u1", "u2"]}],
+        })
+        self.assertEqual(issues, [
+            "Timeline 'e': lieu inconnu 'Nulle part'",
+            "Groupe 'g1': membre inconnu 'u2'",
+            "Utilisateur 'u1': groupe inconnu 'g2'",
+        ])
+
+    def test_ignores_malformed_ids_and_members(self):
+        issues, _ = validate_assets.validate_cross_references({
+            "users": [{"id": ["u1"]}, {"id": "u2", "groups": "abc"}],
+            "groups": [{"id": "g", "members": [{"id": "u1"}]}, {"id": {"x": 1}}],
+        })
+        self.assertEqual(issues, [])
+
+
+class LoadJsonTests(unittest.TestCase):
+    def test_rejects_utf8_bom(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "site-config.json"
+            path.write_bytes(b"\xef\xbb\xbf{}")
+            with self.assertRaisesRegex(ValueError, "BOM"):
+                validate_assets.load_json(path)
+
+
+class TimelineTests(unittest.TestCase):
+    def test_reports_entry_issues(self):
+        issues, warnings = validate_assets.validate_timeline({"entries": [
+            {"id": "Bad Id", "year": "1200", "title": "T", "summary": "x" * 281, "imageUrl": "ftp://cdn/x.png"},
+            {"id": "Bad Id", "year": 1},
+        ]}, check_media=False)
+        self.assertEqual(issues, [
+            "Timeline 'Bad Id': id non normalise (attendu: minuscules, chiffres, '-' ou '_')",
+            "Timeline 'Bad Id': champ 'year' doit etre numerique (actuel: '1200')",
+            "Timeline 'Bad Id': imageUrl: URL rejetee par le serveur (ftp://cdn/x.png)",
+            "Timeline 'Bad Id': id non normalise (attendu: minuscules, chiffres, '-' ou '_')",
+            "Timeline 'Bad Id': id en doublon (deja vu a l'index 0)",
+            "Timeline 'Bad Id': title: champ manquant ou vide",
+        ])
+        self.assertEqual(warnings, ["Timeline 'Bad Id': summary: 281 caracteres, tronque a 280 par le serveur"])
+
+    def test_rejects_non_object(self):
+        self.assertEqual(validate_assets.validate_timeline([], check_media=False), (["Timeline: structure attendue = objet"], []))
+
+
+class SiteConfigTests(unittest.TestCase):
+    def test_reports_section_issues(self):
+        issues, warnings = validate_assets.validate_site_config({
+            "home": {"title": "x" * 181, "visuals": {"backgroundImage": "javascript:alert(1)"}},
+            "community": {"discordUrl": "discord.gg/x"},
+            "support": {"contactEmail": "nope"},
+            "legal": [],
+            "changelog": [{"date": "hier", "title": "v1"}, {}],
+        }, check_media=False)
+        self.assertEqual(issues, [
+            "Site config: section 'legal' doit etre un objet",
+            "Site config: home.visuals.backgroundImage: URL rejetee par le serveur (javascript:alert(1))",
+            "Site config: community.discordUrl: URL rejetee par le serveur (discord.gg/x)",
+            "Site config: support.contactEmail invalide ('nope')",
+            "Site config: changelog[1] vide, ignore par le serveur",
+        ])
+        self.assertEqual(warnings, [
+            "Site config: home.title: 181 caracteres, tronque a 180 par le serveur",
+            "Site config: changelog[0] date non reconnue ('hier')",
+        ])
+
+
+class UsersTests(unittest.TestCase):
+    def test_reports_user_issues(self):
+        issues, warnings = validate_assets.validate_users([
+            {"id": "u1", "role": "owner", "groups": "g1", "lastLoginAt": "hier"},
+            {"id": "u1", "provider": "discord"},
+            {"name": "sans id"},
+        ], check_media=False)
+        self.assertEqual(issues, [
+            "Utilisateur 'u1': role inconnu ('owner')",
+            "Utilisateur 'u1': champ groups doit etre une liste de chaines",
+            "Utilisateur 'u1': id en doublon (deja vu a l'index 0)",
+            "Utilisateur 'u1': discordId manquant pour un compte discord",
+            "Utilisateurs[2]: id manquant",
+        ])
+        self.assertEqual(warnings, ["Utilisateur 'u1': lastLoginAt n'est pas une date ISO ('hier')"])
+
+
+class GroupsTests(unittest.TestCase):
+    def test_reports_group_issues(self):
+        issues, warnings = validate_assets.validate_groups({"groups": [
+            {"id": "g1", "name": " ", "color": "red", "x": "1", "members": "u1"},
+            {"id": "g1", "name": "G"},
+            {"id": 3},
+        ]}, check_media=False)
+        self.assertEqual(issues, [
+            "Groupe 'g1': nom manquant",
+            "Groupe 'g1': coordonnee 'x' invalide ('1')",
+            "Groupe 'g1': champ members doit etre une liste",
+            "Groupe 'g1': id en doublon (deja vu a l'index 0)",
+            "Groupes[2]: id manquant",
+        ])
+        self.assertEqual(warnings, ["Groupe 'g1': couleur invalide ('red'), ignoree par le serveur"])
+
+
+class AnnotationsTests(unittest.TestCase):
+    def test_reports_annotation_issues(self):
+        issues, warnings = validate_assets.validate_annotations([
+            {"id": "a", "x": True, "y": 2, "label": "L", "expiresAt": "demain"},
+            {"id": "a", "x": 1, "y": 2, "label": ""},
+            {"x": 1, "y": 1, "label": "L"},
+        ], check_media=False)
+        self.assertEqual(issues, [
+            "Annotation 'a': coordonnee 'x' invalide (True)",
+            "Annotation 'a': expiresAt n'est pas une date ISO ('demain')",
+            "Annotation 'a': id en doublon (deja vu a l'index 0)",
+            "Annotation 'a': label manquant",
+            "Annotations[2]: id manquant, la carte ignorera ce marqueur",
+        ])
+        self.assertEqual(warnings, [])
+
+
+class PipelineTests(unittest.TestCase):
+    def test_process_pool_matches_in_process_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            documents = {
+                "types": {"Ville": {"icon": "assets/icons/Ville.png", "zoom": 1}},
+                "locations": {"Vruliwen": [{"name": "Imossa", "type": "Ville", "x": "nord", "y": 2}]},
+                "timeline": {"entries": [{"id": "e", "year": 1, "title": "E", "locationNames": ["Nulle part"]}]},
+                "users": [{"id": "u1", "role": "owner"}],
+                "groups": [{"id": "g1", "name": "G", "members": ["u2"]}],
+            }
+            paths = {kind: root / f"{kind}.json" for kind in (*documents, "annotations")}
+            for kind, payload in documents.items():
+                paths[kind].write_text(json.dumps(payload), encoding="utf-8")
+
+            sequential = validate_assets.run_pipeline(paths, check_media=False, jobs=1)
+            # Les processus lances par "spawn" (Windows, macOS) doivent aussi trouver tools/.
+            python_path = os.pathsep.join(filter(None, [str(TOOLS_DIR), os.environ.get("PYTHONPATH")]))
+            with mock.patch.dict(os.environ, {"PYTHONPATH": python_path}):
+                pooled = validate_assets.run_pipeline(paths, check_media=False, jobs=2)
+
+        self.assertEqual(pooled, sequential)
+        _, issues, warnings = sequential
+        self.assertIn("Imossa: coordonnee 'x' invalide ('nord')", issues)
+        self.assertIn("Utilisateur 'u1': role inconnu ('owner')", issues)
+        self.assertIn("Groupe 'g1': membre inconnu 'u2'", issues)
+        self.assertTrue(any(warning.startswith("Annotations: fichier absent") for warning in warnings))
+
+
+@unittest.skipUnless(shutil.which("git"), "git requis")
+class SinceModeTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        assets = self.root / "assets"
+        (assets / "images").mkdir(parents=True)
+        (assets / "icons").mkdir()
+        (assets / "images" / "Brumeport.jpg").write_bytes(b"jpg")
+        (assets / "images" / "frise.png").write_bytes(b"png")
+        (assets / "icons" / "Camp.png").write_bytes(b"png")
+        self.write_json("types.json", {
+            "Camp": {"icon": "assets/icons/Camp.png", "zoom": 1},
+            "Ville": {"icon": "assets/icons/Camp.png", "zoom": 1},
+        })
+        self.write_json("locations.json", {"Vruliwen": [
+            {"name": "Brumeport", "type": "Ville", "x": 1, "y": 2, "images": ["assets/images/Brumeport.jpg"]},
+            {"name": "Imossa", "type": "Ville", "x": 3, "y": 4},
+        ]})
+        self.write_json("timeline.json", {"entries": [
+            {"id": "e", "year": 1, "title": "E", "imageUrl": "/assets/images/frise.png"},
+        ]})
+        self.git("init", "-q")
+        self.git("add", "-A")
+        self.git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "base")
+        self.patches = [
+            mock.patch.object(validate_assets, "ROOT", self.root),
+            mock.patch.object(validate_assets, "ASSETS_DIR", assets),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.directory.cleanup()
+
+    def write_json(self, name, payload):
+        (self.root / "assets" / name).write_text(json.dumps(payload), encoding="utf-8")
+
+    def git(self, *args):
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def run_since(self):
+        assets = self.root / "assets"
+        paths = {
+            "types": assets / "types.json",
+            "locations": assets / "locations.json",
+            "timeline": assets / "timeline.json",
+        }
+        changes = validate_assets.collect_changes("HEAD", paths)
+        _, issues, _ = validate_assets.run_pipeline(paths, check_media=True, jobs=1, changes=changes)
+        return changes, issues
+
+    def test_unchanged_tree_revalidates_nothing(self):
+        changes, issues = self.run_since()
+        self.assertEqual(changes["locations"], set())
+        self.assertEqual(changes["types"], set())
+        self.assertEqual(changes["unchanged"], {"types", "locations", "timeline"})
+        self.assertEqual(issues, [])
+
+    def test_only_edited_entries_are_revalidated(self):
+        locations = json.loads((self.root / "assets" / "locations.json").read_text(encoding="utf-8"))
+        locations["Vruliwen"][1]["x"] = "nord"
+        locations["Vruliwen"].append({"name": "Brumeport", "x": 0, "y": 0})
+        self.write_json("locations.json", locations)
+        changes, issues = self.run_since()
+        self.assertEqual(changes["locations"], {("Vruliwen", "Imossa"), ("Vruliwen", "Brumeport")})
+        self.assertIn("Imossa: coordonnee 'x' invalide ('nord')", issues)
+        self.assertIn("Doublon de nom 'Brumeport' (deja vu dans Vruliwen[0])", issues)
+
+    def test_deleted_media_is_detected_without_json_change(self):
+        (self.root / "assets" / "images" / "Brumeport.jpg").unlink()
+        (self.root / "assets" / "icons" / "Camp.png").unlink()
+        changes, issues = self.run_since()
+        self.assertEqual(changes["locations"], {("Vruliwen", "Brumeport")})
+        self.assertEqual(changes["types"], {"Camp", "Ville"})
+        self.assertIn("Brumeport: image introuvable (assets/images/Brumeport.jpg)", issues)
+        self.assertIn("Type 'Camp': icone introuvable (assets/icons/Camp.png)", issues)
+
+    def test_deleted_timeline_media_revalidates_timeline(self):
+        (self.root / "assets" / "images" / "frise.png").unlink()
+        changes, _ = self.run_since()
+        self.assertNotIn("timeline", changes["unchanged"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""Manifeste des pistes d'ambiance (assets/audio).
+
+Analyse en pur Python des en-tetes de trames MP3 : duree, debit moyen, frequence
+d'echantillonnage et position de la premiere trame audio (apres l'etiquette ID3v2).
+Les en-tetes Xing/Info et VBRI donnent directement le nombre de trames ; a defaut,
+toutes les trames sont parcourues. Les resultats sont mis en cache par (taille, mtime)
+et le manifeste permet au lecteur de connaitre une piste sans la telecharger.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from validate_assets import ASSETS_DIR, ROOT, repo_relative
+
+AUDIO_DIR = ASSETS_DIR / "audio"
+MANIFEST_PATH = ASSETS_DIR / "audio-manifest.json"
+CACHE_PATH = ROOT / ".cache" / "audio-manifest.json"
+SCANNER_VERSION = 3
+MAX_SIZE = 25 * 1024 * 1024  # MAX_UPLOAD_SIZE de server.js
+SYNC_SEARCH_LIMIT = 64 * 1024
+AUDIO_EXTENSIONS = {".mp3", ".ogg", ".wav", ".flac", ".aac", ".m4a"}
+LFS_POINTER_PREFIX = b"version https://git-lfs.github.com/spec/"
+
+# Debits en kbps indexes par (version MPEG 1 ou 2/2.5, couche).
+BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG 1
+    2: (22050, 24000, 16000),  # MPEG 2
+    0: (11025, 12000, 8000),   # MPEG 2.5
+}
+
+
+def parse_frame_header(data: Any, offset: int) -> Optional[Dict[str, int]]:
+    """Decode l'en-tete de trame a `offset` ; None si ce n'est pas une trame valide."""
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset], data[offset + 1], data[offset + 2], data[offset + 3]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    layer = 4 - layer_bits
+    family = 1 if version_bits == 3 else 2
+    bitrate = BITRATES[(family, layer)][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (b2 >> 1) & 0x01
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 576 if layer == 3 and family == 2 else 1152
+        length = samples // 8 * bitrate // sample_rate + padding
+    return {
+        "version": family,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sampleRate": sample_rate,
+        "channels": 1 if (b3 >> 6) == 3 else 2,
+        "samples": samples,
+        "length": length,
+    }
+
+
+def skip_id3v2(data: Any) -> int:
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def find_first_frame(data: Any, start: int) -> Optional[Tuple[int, Dict[str, int]]]:
+    """Premiere trame suivie d'une seconde trame coherente (evite les faux octets de synchro)."""
+    limit = min(len(data) - 4, start + SYNC_SEARCH_LIMIT)
+    offset = data.find(b"\xff", start, limit + 1)
+    while 0 <= offset <= limit:
+        header = parse_frame_header(data, offset)
+        if header:
+            following = offset + header["length"]
+            if following + 4 > len(data):
+                return offset, header
+            next_header = parse_frame_header(data, following)
+            if next_header and next_header["sampleRate"] == header["sampleRate"] and next_header["layer"] == header["layer"]:
+                return offset, header
+        offset = data.find(b"\xff", offset + 1, limit + 1)
+    return None
+
+
+def read_vbr_frame_count(data: Any, offset: int, header: Dict[str, int]) -> Optional[Tuple[Optional[int], bool]]:
+    """(nombre de trames ou None s'il n'est pas annonce, debit variable) d'un en-tete Xing/Info ou VBRI.
+
+    None si la premiere trame ne porte aucun de ces en-tetes.
+    """
+    if header["version"] == 1:
+        side_info = 17 if header["channels"] == 1 else 32
+    else:
+        side_info = 9 if header["channels"] == 1 else 17
+    xing = offset + 4 + side_info
+    tag = data[xing:xing + 4]
+    if tag in (b"Xing", b"Info"):
+        flags = int.from_bytes(data[xing + 4:xing + 8], "big")
+        frames = int.from_bytes(data[xing + 8:xing + 12], "big") if flags & 0x01 else None
+        return frames, tag == b"Xing"
+    vbri = offset + 36
+    if data[vbri:vbri + 4] == b"VBRI":
+        return int.from_bytes(data[vbri + 14:vbri + 18], "big"), True
+    return None
+
+
+def audio_end(data: Any) -> int:
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    return end
+
+
+def scan_mp3(data: Any) -> Optional[Dict[str, Any]]:
+    first = find_first_frame(data, skip_id3v2(data))
+    if first is None:
+        return None
+    offset, header = first
+    end = audio_end(data)
+    sample_rate = header["sampleRate"]
+
+    announced = read_vbr_frame_count(data, offset, header)
+    if announced:
+        # La trame Xing/Info/VBRI ne contient pas de son : l'audio commence apres elle,
+        # que le nombre de trames soit annonce ou non.
+        offset += header["length"]
+    if announced and announced[0]:
+        frames, vbr = announced
+        audio_bytes = end - offset
+        duration = frames * header["samples"] / sample_rate
+    else:
+        frames = 0
+        samples = 0
+        audio_bytes = 0
+        bitrates = set()
+        position = offset
+        while position + 4 <= end:
+            frame = parse_frame_header(data, position)
+            if frame is None or frame["sampleRate"] != sample_rate:
+                break
+            frames += 1
+            samples += frame["samples"]
+            audio_bytes += frame["length"]
+            bitrates.add(frame["bitrate"])
+            position += frame["length"]
+        duration = samples / sample_rate
+        vbr = len(bitrates) > 1
+    bitrate = round(audio_bytes * 8 / duration / 1000) if duration else header["bitrate"] // 1000
+    return {
+        "duration": round(duration, 3),
+        "bitrate": bitrate,
+        "sampleRate": sample_rate,
+        "channels": header["channels"],
+        "audioOffset": offset,
+        "frames": frames,
+        "vbr": vbr,
+    }
+
+
+def scan_track(path: Path, max_size: int) -> Dict[str, Any]:
+    """Analyse une piste (execute dans un processus du pool)."""
+    stats = path.stat()
+    record: Dict[str, Any] = {"size": stats.st_size, "mtime": stats.st_mtime_ns, "issues": []}
+    if stats.st_size > max_size:
+        record["issues"].append("oversized")
+    extension = path.suffix.lower()
+    if extension not in AUDIO_EXTENSIONS:
+        record["issues"].append("non-audio")
+        return record
+    if stats.st_size == 0:
+        record["issues"].append("non-audio")
+        return record
+    with path.open("rb") as handle:
+        if handle.read(len(LFS_POINTER_PREFIX)) == LFS_POINTER_PREFIX:
+            record["issues"].append("lfs-pointer")
+            return record
+        if extension != ".mp3":
+            record["issues"].append("unsupported")
+            return record
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            metadata = scan_mp3(data)
+    if metadata is None:
+        record["issues"].append("non-audio")
+    else:
+        record.update(metadata)
+    return record
+
+
+def load_cache(path: Optional[Path]) -> Dict[str, Dict[str, Any]]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != SCANNER_VERSION:
+        return {}
+    tracks = payload.get("tracks")
+    return tracks if isinstance(tracks, dict) else {}
+
+
+def save_json(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def build_manifest(
+    audio_dir: Path,
+    cache: Dict[str, Dict[str, Any]],
+    *,
+    max_size: int,
+    jobs: Optional[int] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """Retourne les enregistrements par chemin relatif et le nombre de pistes re-analysees."""
+    paths = sorted(path for path in audio_dir.rglob("*") if path.is_file())
+    records: Dict[str, Dict[str, Any]] = {}
+    pending: List[Tuple[str, Path]] = []
+    for path in paths:
+        key = repo_relative(path) or path.as_posix()
+        stats = path.stat()
+        cached = cache.get(key)
+        if (
+            isinstance(cached, dict)
+            and cached.get("size") == stats.st_size
+            and cached.get("mtime") == stats.st_mtime_ns
+            and ("oversized" in cached.get("issues", [])) == (stats.st_size > max_size)
+        ):
+            records[key] = cached
+        else:
+            pending.append((key, path))
+
+    if jobs == 1 or len(pending) < 2:
+        scanned = [scan_track(path, max_size) for _, path in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            scanned = list(executor.map(scan_track, [path for _, path in pending], [max_size] * len(pending)))
+    for (key, _), record in zip(pending, scanned):
+        records[key] = record
+    return dict(sorted(records.items())), len(pending)
+
+
+def main() -> int:
+    try:
+        sys.stdout.reconfigure(encoding="utf-8")
+    except AttributeError:
+        pass
+
+    parser = argparse.ArgumentParser(description="Manifeste des pistes audio (duree, debit, position des trames)")
+    parser.add_argument("--audio-dir", type=Path, default=AUDIO_DIR, help="Dossier des pistes audio")
+    parser.add_argument("--output", type=Path, default=MANIFEST_PATH, help="Chemin du manifeste genere")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH, help="Fichier de cache des analyses")
+    parser.add_argument("--no-cache", action="store_true", help="Re-analyse toutes les pistes")
+    parser.add_argument("--max-size", type=float, default=MAX_SIZE / (1024 * 1024), help="Taille maximale en Mo")
+    parser.add_argument("--jobs", type=int, default=None, help="Nombre de processus d'analyse (1 = sequentiel)")
+    args = parser.parse_args()
+
+    cache_path = None if args.no_cache else args.cache
+    max_size = int(args.max_size * 1024 * 1024)
+    records, scanned = build_manifest(args.audio_dir, load_cache(cache_path), max_size=max_size, jobs=args.jobs)
+    if cache_path is not None:
+        save_json(cache_path, {"version": SCANNER_VERSION, "tracks": records})
+
+    tracks = {
+        key: {field: value for field, value in record.items() if field not in ("mtime", "issues")}
+        for key, record in records.items()
+        if "duration" in record
+    }
+    save_json(args.output, {"version": SCANNER_VERSION, "tracks": tracks})
+
+    errors = [(key, issue) for key, record in records.items() for issue in record["issues"] if issue in ("non-audio", "oversized")]
+    warnings = [(key, issue) for key, record in records.items() for issue in record["issues"] if issue not in ("non-audio", "oversized")]
+    labels = {
+        "non-audio": "aucune trame audio reconnue",
+        "oversized": f"fichier au-dela de {args.max_size:g} Mo",
+        "lfs-pointer": "pointeur Git LFS (executer git lfs pull)",
+        "unsupported": "format non analyse (seul le MP3 est pris en charge)",
+    }
+    if errors:
+        print("\n[ERREUR] Pistes a corriger :")
+        for key, issue in errors:
+            print(f" - {key}: {labels[issue]}")
+    else:
+        print("[OK] Aucune piste invalide")
+    if warnings:
+        print("\n[AVERTISSEMENTS] Pistes non analysees :")
+        for key, issue in warnings:
+            print(f" - {key}: {labels[issue]}")
+
+    total_duration = sum(track["duration"] for track in tracks.values())
+    print(
+        f"\nResume : {len(records)} fichiers, {len(tracks)} pistes analysees "
+        f"({scanned} re-analysees), {total_duration / 60:.1f} min au total."
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
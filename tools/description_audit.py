@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""Detection des passages quasi dupliques entre les lieux (description, history, lore).
+
+Les textes sont normalises comme dans server/routes/locations.js (stripMarkdown,
+splitIntoSentences, normalizeSentenceKey) puis compares par MinHash + LSH : seules
+les paires partageant une bande de signature sont verifiees, ce qui garde l'analyse
+quasi lineaire en nombre de phrases. Les signatures sont mises en cache par empreinte
+du texte normalise.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from validate_assets import LOCATIONS_PATH, ROOT, load_json
+
+CACHE_PATH = ROOT / ".cache" / "description-audit.json"
+TEXT_FIELDS = ("description", "history", "lore")
+MIN_SENTENCE_LENGTH = 35
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16
+MERSENNE_PRIME = (1 << 61) - 1
+FALLBACK_PATTERNS = (
+    re.compile(r"\best un lieu (de type .+|notable) (situe sur|de l univers)\b"),
+    re.compile(r"\bil merite encore une description editee plus detaillee\b"),
+    re.compile(r"^il se distingue notamment par\b"),
+)
+
+
+def _permutations() -> List[Tuple[int, int]]:
+    # Coefficients deterministes : le cache reste valide d'une execution a l'autre.
+    coefficients = []
+    for index in range(NUM_PERM):
+        digest = hashlib.blake2b(f"minhash-{index}".encode("ascii"), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little") % (MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "little") % MERSENNE_PRIME
+        coefficients.append((a, b))
+    return coefficients
+
+
+PERMUTATIONS = _permutations()
+CACHE_VERSION = f"v1-{NUM_PERM}-{SHINGLE_SIZE}"
+
+
+def strip_markdown(value: Any) -> str:
+    text = str(value if value is not None else "").strip()
+    text = re.sub(r"```[\s\S]*?```", " ", text)
+    text = re.sub(r"`([^`]+)`", r"\1", text)
+    text = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", r"\1", text)
+    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r"\1", text)
+    text = re.sub(r"\[\[([^\]|]+)\|([^\]]+)\]\]", r"\2", text)
+    text = re.sub(r"\[\[([^\]]+)\]\]", r"\1", text)
+    text = re.sub(r"^#{1,6}\s+", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^\s*>\s?", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^\s*[-*+]\s+", "", text, flags=re.MULTILINE)
+    text = re.sub(r"[_*~]", "", text)
+    text = text.replace("|", " ").replace("\r", "\n")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def normalize_sentence_key(value: Any) -> str:
+    decomposed = unicodedata.normalize("NFD", strip_markdown(value).lower())
+    text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def split_into_sentences(value: Any) -> List[str]:
+    cleaned = strip_markdown(value)
+    if not cleaned:
+        return []
+    sentences = []
+    for chunk in re.split(r"(?<=[.!?])\s+(?=[A-Z0-9À-ÿ])", cleaned):
+        sentences.extend(part.strip() for part in re.split(r"\s*;\s*", chunk))
+    return [sentence for sentence in sentences if len(sentence) >= MIN_SENTENCE_LENGTH]
+
+
+def collect_text_entries(value: Any) -> List[Tuple[str, str]]:
+    """(libelle du champ, texte) ; l'index des listes reste celui du JSON, elements vides compris."""
+    items = value if isinstance(value, list) else [value]
+    entries = []
+    for index, entry in enumerate(items):
+        text = str(entry if entry is not None else "").strip()
+        if text:
+            entries.append((f"[{index}]" if isinstance(value, list) else "", text))
+    return entries
+
+
+def collect_passages(dataset: Dict[str, Any]) -> List[Dict[str, Any]]:
+    passages: List[Dict[str, Any]] = []
+    for continent, raw_locations in dataset.items():
+        if not isinstance(raw_locations, list):
+            continue
+        for entry in raw_locations:
+            if not isinstance(entry, dict) or not str(entry.get("name") or "").strip():
+                continue
+            name = str(entry["name"]).strip()
+            for field in TEXT_FIELDS:
+                for suffix, text in collect_text_entries(entry.get(field)):
+                    for sentence in split_into_sentences(text):
+                        key = normalize_sentence_key(sentence)
+                        if not key:
+                            continue
+                        passages.append({
+                            "continent": continent,
+                            "name": name,
+                            "field": field + suffix,
+                            "text": sentence,
+                            "key": key,
+                        })
+    return passages
+
+
+def shingles(key: str) -> Set[str]:
+    words = key.split()
+    if len(words) <= SHINGLE_SIZE:
+        return {key}
+    return {" ".join(words[index:index + SHINGLE_SIZE]) for index in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set: Iterable[str]) -> List[int]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for shingle in shingle_set
+    ]
+    return [min((a * value + b) % MERSENNE_PRIME for value in hashes) for a, b in PERMUTATIONS]
+
+
+def content_hash(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def load_cache(path: Optional[Path]) -> Dict[str, List[int]]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return {}
+    signatures = payload.get("signatures")
+    return signatures if isinstance(signatures, dict) else {}
+
+
+def save_cache(path: Optional[Path], signatures: Dict[str, List[int]]) -> None:
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": CACHE_VERSION, "signatures": signatures}
+    path.write_text(json.dumps(payload, separators=(",", ":")) + "\n", encoding="utf-8")
+
+
+def compute_signatures(passages: List[Dict[str, Any]], cache: Dict[str, List[int]]) -> Tuple[Dict[str, List[int]], int]:
+    """Retourne les signatures utiles (par empreinte) et le nombre de signatures recalculees."""
+    signatures: Dict[str, List[int]] = {}
+    computed = 0
+    for passage in passages:
+        digest = content_hash(passage["key"])
+        passage["hash"] = digest
+        if digest in signatures:
+            continue
+        cached = cache.get(digest)
+        if isinstance(cached, list) and len(cached) == NUM_PERM:
+            signatures[digest] = cached
+            continue
+        signatures[digest] = minhash(shingles(passage["key"]))
+        computed += 1
+    return signatures, computed
+
+
+def candidate_pairs(signatures: Dict[str, List[int]]) -> Set[Tuple[str, str]]:
+    rows = NUM_PERM // BANDS
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = defaultdict(list)
+    for digest, signature in signatures.items():
+        for band in range(BANDS):
+            buckets[(band, tuple(signature[band * rows:(band + 1) * rows]))].append(digest)
+    pairs: Set[Tuple[str, str]] = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for index, left in enumerate(members):
+            for right in members[index + 1:]:
+                pairs.add((left, right) if left < right else (right, left))
+    return pairs
+
+
+def jaccard(left: Set[str], right: Set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def find_clusters(passages: List[Dict[str, Any]], signatures: Dict[str, List[int]], threshold: float) -> List[Dict[str, Any]]:
+    by_hash: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    keys: Dict[str, str] = {}
+    for passage in passages:
+        by_hash[passage["hash"]].append(passage)
+        keys[passage["hash"]] = passage["key"]
+
+    parent = {digest: digest for digest in by_hash}
+
+    def find(digest: str) -> str:
+        while parent[digest] != digest:
+            parent[digest] = parent[parent[digest]]
+            digest = parent[digest]
+        return digest
+
+    shingle_cache: Dict[str, Set[str]] = {}
+    for left, right in candidate_pairs(signatures):
+        left_shingles = shingle_cache.setdefault(left, shingles(keys[left]))
+        right_shingles = shingle_cache.setdefault(right, shingles(keys[right]))
+        if jaccard(left_shingles, right_shingles) >= threshold:
+            parent[find(left)] = find(right)
+
+    grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for digest, members in by_hash.items():
+        grouped[find(digest)].extend(members)
+
+    clusters = []
+    for members in grouped.values():
+        if len(members) < 2:
+            continue
+        locations = sorted({(member["continent"], member["name"]) for member in members})
+        representative = max(members, key=lambda member: len(member["text"]))
+        clusters.append({
+            "text": representative["text"],
+            "fallback": any(pattern.search(representative["key"]) for pattern in FALLBACK_PATTERNS),
+            "occurrences": len(members),
+            "locations": len(locations),
+            "characters": sum(len(member["text"]) for member in members),
+            "members": [
+                {key: member[key] for key in ("continent", "name", "field", "text")}
+                for member in members
+            ],
+        })
+    # Priorite aux textes reutilises dans le plus de lieux, puis au volume a reecrire.
+    clusters.sort(key=lambda cluster: (-cluster["locations"], -cluster["occurrences"], -cluster["characters"], cluster["text"]))
+    return clusters
+
+
+def main() -> int:
+    try:
+        sys.stdout.reconfigure(encoding="utf-8")
+    except AttributeError:
+        pass
+
+    parser = argparse.ArgumentParser(description="Detection des passages dupliques entre les lieux")
+    parser.add_argument("--locations", type=Path, default=LOCATIONS_PATH, help="Chemin du fichier locations.json")
+    parser.add_argument("--threshold", type=float, default=0.6, help="Similarite de Jaccard minimale (0-1)")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH, help="Fichier de cache des signatures MinHash")
+    parser.add_argument("--no-cache", action="store_true", help="Recalcule toutes les signatures sans cache")
+    parser.add_argument("--limit", type=int, default=20, help="Nombre maximal de groupes affiches")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON complete")
+    args = parser.parse_args()
+
+    cache_path = None if args.no_cache else args.cache
+    passages = collect_passages(load_json(args.locations))
+    signatures, computed = compute_signatures(passages, load_cache(cache_path))
+    save_cache(cache_path, signatures)
+    clusters = find_clusters(passages, signatures, args.threshold)
+
+    if args.json:
+        print(json.dumps({
+            "summary": {
+                "passages": len(passages),
+                "uniquePassages": len(signatures),
+                "signaturesComputed": computed,
+                "clusters": len(clusters),
+            },
+            "clusters": clusters,
+        }, ensure_ascii=False, indent=2))
+        return 0
+
+    if not clusters:
+        print("[OK] Aucun passage duplique detecte")
+    else:
+        print("[DOUBLONS] Passages a reecrire, par priorite :")
+        for rank, cluster in enumerate(clusters[:args.limit], start=1):
+            marker = " [texte de repli]" if cluster["fallback"] else ""
+            print(f"\n{rank}. {cluster['locations']} lieux, {cluster['occurrences']} occurrences{marker}")
+            print(f"   \"{cluster['text']}\"")
+            for member in cluster["members"]:
+                print(f"   - {member['continent']} / {member['name']} ({member['field']})")
+        if len(clusters) > args.limit:
+            print(f"\n... {len(clusters) - args.limit} groupes supplementaires (--limit ou --json).")
+
+    print(
+        f"\nResume : {len(passages)} phrases ({len(signatures)} uniques), "
+        f"{computed} signatures calculees, {len(clusters)} groupes de doublons."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
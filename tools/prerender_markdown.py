@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+"""Pre-rendu Markdown des fiches de lieux.
+
+Portage de js/ui/markdown.mjs (sans DOMPurify, applique cote client) : chaque champ
+description / history / lore de locations.json est rendu en HTML, avec les liens
+[[wiki]] resolus vers le nom canonique du lieu. La chronologie n'est pas concernee :
+timelinePanel affiche summary / content en texte brut (textContent).
+Les fragments sont mis en cache par empreinte du texte, et un fichier compact par lieu
+est ecrit dans assets/prerendered/ pour un chargement a la demande cote client.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from validate_assets import LOCATIONS_PATH, ROOT, load_json, normalize_lookup_key
+
+OUTPUT_DIR = ROOT / "assets" / "prerendered"
+CACHE_PATH = ROOT / ".cache" / "markdown-prerender.json"
+MARKDOWN_MODULE = ROOT / "js" / "ui" / "markdown.mjs"
+UNIT_CASES_PATH = ROOT / "tests" / "unit" / "markdown-cases.json"  # cas de tests/unit/run.mjs
+RENDERER_VERSION = "markdown.mjs-1"
+LOCATION_FIELDS = ("description", "history", "lore")
+
+
+# Classes equivalentes a `\s` et `.` en JavaScript (differentes de celles de Python).
+JS_SPACE = "\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff"
+WS = f"[{JS_SPACE}]"
+DOT = "[^\n\r\u2028\u2029]"
+
+CODE_PATTERN = re.compile(r"`([^`]+)`")
+WIKI_LINK_PATTERN = re.compile(r"\[\[([^\]]+)\]\]")
+LINK_PATTERN = re.compile(rf"\[([^\]]+)\]\(([^){JS_SPACE}]+)(?:{WS}+\"([^\"]*)\")?\)")
+STRONG_PATTERN = re.compile(rf"(\*\*|__)({DOT}+?)\1")
+EM_PATTERN = re.compile(r"(\*|_)([^*_]+?)\1")
+DEL_PATTERN = re.compile(rf"~~({DOT}+?)~~")
+LIST_PATTERN = re.compile(rf"^{WS}*[-*+]{WS}+({DOT}*)$")
+HEADING_PATTERN = re.compile(rf"^(#{{1,6}}){WS}+({DOT}*)$")
+UNSAFE_SCHEME_PATTERN = re.compile(r"^(javascript|data|vbscript):", re.IGNORECASE)
+
+
+def js_trim(value: str) -> str:
+    return re.sub(rf"^{WS}+|{WS}+$", "", value)
+
+
+def js_truthy(value: Any) -> bool:
+    return value is not None and value is not False and value != "" and not (
+        isinstance(value, (int, float)) and not isinstance(value, bool) and (value == 0 or value != value)
+    )
+
+
+def escape_html(value: str) -> str:
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#39;")
+    )
+
+
+def escape_attribute(value: str) -> str:
+    return (
+        value.replace("&", "&amp;")
+        .replace('"', "&quot;")
+        .replace("'", "&#39;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+    )
+
+
+def encode_uri_component(value: str) -> str:
+    return quote(value, safe="-_.!~*'()")
+
+
+def sanitize_url(raw: Optional[str]) -> str:
+    value = js_trim(raw or "")
+    if not value:
+        return "#"
+    if UNSAFE_SCHEME_PATTERN.match(value):
+        return "#"
+    return escape_attribute(value)
+
+
+def apply_inline_formatting(text: str) -> str:
+    if not text:
+        return ""
+    codes: List[str] = []
+    location_links: List[Tuple[str, str]] = []
+
+    def stash_code(match: re.Match) -> str:
+        codes.append(f"<code>{escape_html(match.group(1))}</code>")
+        return f"@@CODE{len(codes) - 1}@@"
+
+    def stash_location(match: re.Match) -> str:
+        parts = [js_trim(part) for part in match.group(1).split("|")]
+        parts = [part for part in parts if part]
+        if not parts:
+            return match.group(0)
+        label = parts[0]
+        target = parts[1] if len(parts) > 1 else parts[0]
+        location_links.append((label, target))
+        return f"@@LOC{len(location_links) - 1}@@"
+
+    def render_link(match: re.Match) -> str:
+        label, href, title = match.group(1), match.group(2), match.group(3)
+        safe_title = f' title="{escape_attribute(title)}"' if title else ""
+        return f'<a href="{sanitize_url(href)}" target="_blank" rel="noopener noreferrer"{safe_title}>{label}</a>'
+
+    def restore_location(match: re.Match) -> str:
+        index = int(match.group(1))
+        if index >= len(location_links):
+            return ""
+        label, target = location_links[index]
+        target = js_trim(target)
+        return (
+            f'<a href="#location:{encode_uri_component(target)}" class="location-link" '
+            f'data-location="{escape_attribute(target)}">{escape_html(label)}</a>'
+        )
+
+    result = CODE_PATTERN.sub(stash_code, text)
+    result = WIKI_LINK_PATTERN.sub(stash_location, result)
+    result = escape_html(result)
+    result = LINK_PATTERN.sub(render_link, result)
+    result = STRONG_PATTERN.sub(r"<strong>\2</strong>", result)
+    result = EM_PATTERN.sub(r"<em>\2</em>", result)
+    result = DEL_PATTERN.sub(r"<del>\1</del>", result)
+    result = re.sub(r"@@CODE(\d+)@@", lambda match: codes[int(match.group(1))] if int(match.group(1)) < len(codes) else "", result)
+    result = re.sub(r"@@LOC(\d+)@@", restore_location, result)
+    return result.replace("\n", "<br>")
+
+
+def render_markdown(source: Any = "") -> str:
+    """Equivalent de renderMarkdown (js/ui/markdown.mjs) hors DOMPurify."""
+    source = "" if source is None else str(source)
+    if not js_trim(source):
+        return ""
+
+    lines = re.sub(r"\r\n?", "\n", source).split("\n")
+    html_parts: List[str] = []
+    paragraph_lines: List[str] = []
+    list_items: List[str] = []
+    code_lines: List[str] = []
+    in_list = False
+    in_code_block = False
+
+    def flush_paragraph() -> None:
+        nonlocal paragraph_lines
+        if paragraph_lines:
+            html_parts.append(f"<p>{apply_inline_formatting(chr(10).join(paragraph_lines))}</p>")
+            paragraph_lines = []
+
+    def flush_list() -> None:
+        nonlocal list_items, in_list
+        if not in_list:
+            return
+        if list_items:
+            html_parts.append(f"<ul>{''.join(list_items)}</ul>")
+        list_items = []
+        in_list = False
+
+    def flush_code() -> None:
+        nonlocal code_lines, in_code_block
+        if not in_code_block:
+            return
+        html_parts.append(f"<pre><code>{escape_html(chr(10).join(code_lines))}</code></pre>")
+        code_lines = []
+        in_code_block = False
+
+    for line in lines:
+        trimmed = js_trim(line)
+        if trimmed.startswith("```"):
+            if in_code_block:
+                flush_code()
+            else:
+                flush_paragraph()
+                flush_list()
+                in_code_block = True
+                code_lines = []
+            continue
+        if in_code_block:
+            code_lines.append(line)
+            continue
+
+        list_match = LIST_PATTERN.match(line)
+        if list_match:
+            flush_paragraph()
+            if not in_list:
+                in_list = True
+                list_items = []
+            list_items.append(f"<li>{apply_inline_formatting(list_match.group(1))}</li>")
+            continue
+
+        if not trimmed:
+            flush_paragraph()
+            flush_list()
+            continue
+
+        heading_match = HEADING_PATTERN.match(trimmed)
+        if heading_match:
+            flush_paragraph()
+            flush_list()
+            level = len(heading_match.group(1))
+            html_parts.append(f"<h{level}>{apply_inline_formatting(js_trim(heading_match.group(2)))}</h{level}>")
+            continue
+
+        paragraph_lines.append(line)
+
+    flush_paragraph()
+    flush_list()
+    flush_code()
+
+    html = "".join(html_parts)
+    return html or escape_html(source).replace("\n", "<br>")
+
+
+class WikiLinkResolver:
+    """Reecrit les cibles [[...]] vers le nom canonique du lieu, comme focusLocationByName."""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.exact: Dict[str, str] = {}
+        self.loose: Dict[str, str] = {}
+        for name in names:
+            self.exact.setdefault(js_trim(name).lower(), name)
+            self.loose.setdefault(normalize_lookup_key(name), name)
+        self.unresolved: Dict[str, int] = {}
+
+    def resolve(self, target: str) -> Optional[str]:
+        return self.exact.get(js_trim(target).lower()) or self.loose.get(normalize_lookup_key(target))
+
+    def rewrite(self, text: str) -> str:
+        """Reecrit bloc par bloc, avec le meme decoupage (lignes, blocs ```) que render_markdown."""
+        if "[[" not in text:
+            return text
+        output: List[str] = []
+        paragraph_lines: List[str] = []
+        in_code_block = False
+
+        def flush_paragraph() -> None:
+            if paragraph_lines:
+                output.append(self.rewrite_inline("\n".join(paragraph_lines)))
+                paragraph_lines.clear()
+
+        for line in re.sub(r"\r\n?", "\n", text).split("\n"):
+            trimmed = js_trim(line)
+            if trimmed.startswith("```"):
+                flush_paragraph()
+                in_code_block = not in_code_block
+                output.append(line)
+            elif in_code_block:
+                output.append(line)
+            elif LIST_PATTERN.match(line) or (trimmed and HEADING_PATTERN.match(trimmed)):
+                # Le prefixe ("- ", "## ") ne contient ni ` ni [[ : la ligne entiere peut etre reecrite.
+                flush_paragraph()
+                output.append(self.rewrite_inline(line))
+            elif not trimmed:
+                flush_paragraph()
+                output.append(line)
+            else:
+                paragraph_lines.append(line)
+        flush_paragraph()
+        return "\n".join(output)
+
+    def rewrite_inline(self, text: str) -> str:
+        def replace(match: re.Match) -> str:
+            parts = [js_trim(part) for part in match.group(1).split("|")]
+            parts = [part for part in parts if part]
+            if not parts:
+                return match.group(0)
+            label = parts[0]
+            target = parts[1] if len(parts) > 1 else parts[0]
+            canonical = self.resolve(target)
+            if canonical is None:
+                self.unresolved[target] = self.unresolved.get(target, 0) + 1
+                return match.group(0)
+            if canonical == target:
+                return match.group(0)
+            return f"[[{label}|{canonical}]]"
+
+        # Les spans de code d'un meme bloc restent intacts, comme dans applyInlineFormatting.
+        pieces = re.split(r"(`[^`]+`)", text)
+        return "".join(piece if index % 2 else WIKI_LINK_PATTERN.sub(replace, piece) for index, piece in enumerate(pieces))
+
+
+class FragmentRenderer:
+    def __init__(self, resolver: WikiLinkResolver, cache: Dict[str, str]) -> None:
+        self.resolver = resolver
+        self.cache = cache
+        self.used: Dict[str, str] = {}
+        self.rendered = 0
+
+    def render(self, text: Any) -> str:
+        source = self.resolver.rewrite("" if text is None else str(text))
+        digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        html = self.used.get(digest)
+        if html is None:
+            html = self.cache.get(digest)
+            if not isinstance(html, str):
+                html = render_markdown(source)
+                self.rendered += 1
+            self.used[digest] = html
+        return html
+
+    def render_field(self, value: Any) -> Any:
+        # Meme filtre que infoPanel.renderSection (filter(Boolean)) pour garder les index
+        # alignes ; un element non textuel reste a null et sera rendu cote client.
+        if isinstance(value, list):
+            return [self.render(item) if isinstance(item, str) else None for item in value if js_truthy(item)]
+        if isinstance(value, str) and js_truthy(value):
+            return self.render(value)
+        return None
+
+
+def load_cache(path: Optional[Path]) -> Dict[str, str]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != RENDERER_VERSION:
+        return {}
+    fragments = payload.get("fragments")
+    return fragments if isinstance(fragments, dict) else {}
+
+
+def save_cache(path: Optional[Path], fragments: Dict[str, str]) -> None:
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": RENDERER_VERSION, "fragments": fragments}
+    path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+
+
+def write_if_changed(path: Path, payload: Any) -> bool:
+    content = json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+    if path.exists() and path.read_text(encoding="utf-8") == content:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return True
+
+
+def location_file_name(name: str) -> str:
+    return hashlib.sha1(name.encode("utf-8")).hexdigest()[:12] + ".json"
+
+
+def build_sidecars(locations: Dict[str, Any], renderer: FragmentRenderer, output_dir: Path) -> Dict[str, int]:
+    stats = {"locations": 0, "written": 0, "removed": 0}
+    index: Dict[str, Any] = {"version": RENDERER_VERSION, "locations": {}}
+    expected = set()
+
+    for continent, raw_locations in locations.items():
+        if not isinstance(raw_locations, list):
+            continue
+        for entry in raw_locations:
+            if not isinstance(entry, dict) or not isinstance(entry.get("name"), str) or not entry["name"].strip():
+                continue
+            name = entry["name"]
+            fields = {field: renderer.render_field(entry.get(field)) for field in LOCATION_FIELDS}
+            fields = {field: html for field, html in fields.items() if html}
+            if not fields:
+                continue
+            file_name = location_file_name(name)
+            expected.add(file_name)
+            index["locations"][name] = f"locations/{file_name}"
+            stats["locations"] += 1
+            stats["written"] += write_if_changed(output_dir / "locations" / file_name, {"name": name, "continent": continent, **fields})
+
+    stale_timeline = output_dir / "timeline.json"
+    if stale_timeline.exists():
+        stale_timeline.unlink()
+        stats["removed"] += 1
+
+    locations_dir = output_dir / "locations"
+    if locations_dir.exists():
+        for stale in locations_dir.glob("*.json"):
+            if stale.name not in expected:
+                stale.unlink()
+                stats["removed"] += 1
+    stats["written"] += write_if_changed(output_dir / "index.json", index)
+    return stats
+
+
+def verify_against_module(sources: Dict[str, str]) -> List[str]:
+    """Compare le rendu Python a renderMarkdown execute par Node sur les memes textes."""
+    if not shutil.which("node"):
+        raise RuntimeError("node introuvable, verification impossible")
+    script = (
+        "import { renderMarkdown } from " + json.dumps(MARKDOWN_MODULE.as_uri()) + ";"
+        "let raw='';process.stdin.setEncoding('utf8');"
+        "process.stdin.on('data',c=>raw+=c);"
+        "process.stdin.on('end',()=>{const input=JSON.parse(raw);const out={};"
+        "for(const [k,v] of Object.entries(input)){out[k]=renderMarkdown(v);}"
+        "process.stdout.write(JSON.stringify(out));});"
+    )
+    completed = subprocess.run(
+        ["node", "--input-type=module", "-e", script],
+        input=json.dumps(sources), capture_output=True, text=True, encoding="utf-8", check=True,
+    )
+    expected = json.loads(completed.stdout)
+    return [digest for digest, source in sources.items() if render_markdown(source) != expected.get(digest)]
+
+
+def load_unit_cases(path: Path = UNIT_CASES_PATH) -> List[Tuple[str, str]]:
+    """(entree, rendu attendu) des cas executes par tests/unit/run.mjs."""
+    return [(case["input"], case["expected"]) for case in load_json(path)]
+
+
+def check_unit_cases(cases: List[Tuple[str, str]]) -> List[str]:
+    """Rejoue les cas de tests/unit/run.mjs sur le portage Python."""
+    return [source for source, expected in cases if render_markdown(source) != expected]
+
+
+def collect_sources(locations: Dict[str, Any], resolver: WikiLinkResolver, extra: Iterable[str] = ()) -> Dict[str, str]:
+    texts: List[Any] = list(extra)
+    for raw_locations in locations.values():
+        for entry in raw_locations if isinstance(raw_locations, list) else []:
+            if isinstance(entry, dict):
+                texts.extend(entry.get(field) for field in LOCATION_FIELDS)
+    sources: Dict[str, str] = {}
+    for value in texts:
+        for text in value if isinstance(value, list) else [value]:
+            if isinstance(text, str) and js_truthy(text):
+                source = resolver.rewrite(text)
+                sources[hashlib.sha1(source.encode("utf-8")).hexdigest()] = source
+    return sources
+
+
+def main() -> int:
+    try:
+        sys.stdout.reconfigure(encoding="utf-8")
+    except AttributeError:
+        pass
+
+    parser = argparse.ArgumentParser(description="Pre-rendu Markdown des fiches de lieux")
+    parser.add_argument("--locations", type=Path, default=LOCATIONS_PATH, help="Chemin du fichier locations.json")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR, help="Dossier de sortie des fragments")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH, help="Fichier de cache des fragments")
+    parser.add_argument("--no-cache", action="store_true", help="Re-rend tous les textes sans cache")
+    parser.add_argument("--verify", action="store_true", help="Compare chaque fragment au rendu de js/ui/markdown.mjs (Node requis)")
+    args = parser.parse_args()
+
+    locations = load_json(args.locations)
+
+    names = [
+        entry["name"]
+        for raw_locations in locations.values() if isinstance(raw_locations, list)
+        for entry in raw_locations if isinstance(entry, dict) and isinstance(entry.get("name"), str)
+    ]
+    cache_path = None if args.no_cache else args.cache
+    renderer = FragmentRenderer(WikiLinkResolver(names), load_cache(cache_path))
+    stats = build_sidecars(locations, renderer, args.output)
+    save_cache(cache_path, renderer.used)
+
+    if renderer.resolver.unresolved:
+        print("[AVERTISSEMENTS] Liens [[...]] vers des lieux inconnus :")
+        for target, count in sorted(renderer.resolver.unresolved.items()):
+            print(f" - {target} ({count})")
+
+    if args.verify:
+        unit_cases = load_unit_cases()
+        failed_cases = check_unit_cases(unit_cases)
+        if failed_cases:
+            print(f"[ERREUR] {len(failed_cases)} cas de tests/unit/run.mjs non reproduits par le portage :")
+            for source in failed_cases:
+                print(f" - {source[:80]!r}")
+            return 1
+        sources = collect_sources(locations, renderer.resolver, (source for source, _ in unit_cases))
+        try:
+            mismatches = verify_against_module(sources)
+        except (RuntimeError, subprocess.CalledProcessError) as error:
+            print(f"[ERREUR] Verification impossible : {error}")
+            return 1
+        if mismatches:
+            print(f"[ERREUR] {len(mismatches)} fragments differents du rendu de markdown.mjs :")
+            for digest in mismatches[:10]:
+                print(f" - {sources[digest][:80]!r}")
+            return 1
+        print(f"[OK] {len(sources)} fragments identiques au rendu de markdown.mjs")
+
+    print(
+        f"\nResume : {stats['locations']} lieux, {len(renderer.used)} fragments "
+        f"({renderer.rendered} rendus), {stats['written']} fichiers ecrits, {stats['removed']} supprimes."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,33 +3,61 @@ from __future__ import annotations
 
 import argparse
 import json
+import re
+import subprocess
 import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 ROOT = Path(__file__).resolve().parents[1]
 ASSETS_DIR = ROOT / "assets"
 LOCATIONS_PATH = ASSETS_DIR / "locations.json"
 TYPES_PATH = ASSETS_DIR / "types.json"
+TIMELINE_PATH = ASSETS_DIR / "timeline.json"
+SITE_CONFIG_PATH = ASSETS_DIR / "site-config.json"
+USERS_PATH = ASSETS_DIR / "users.json"
+GROUPS_PATH = ASSETS_DIR / "groups.json"
+ANNOTATIONS_PATH = ASSETS_DIR / "annotations.json"
+
+HEX_COLOR_PATTERN = re.compile(r"^#([0-9a-f]{3}|[0-9a-f]{6})$", re.IGNORECASE)
+GROUP_COLOR_PATTERN = re.compile(r"^#?[0-9a-f]{6}$", re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r"^(mailto:)?[^@\s]+@[^@\s]+\.[^@\s]+$", re.IGNORECASE)
+TIMELINE_MAX_ENTRIES = 120
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
 
 
 def load_json(path: Path) -> Any:
     if not path.exists():
         raise FileNotFoundError(f"Fichier introuvable : {path}")
+    raw = path.read_bytes()
+    if raw.startswith(b"\xef\xbb\xbf"):
+        # JSON.parse cote serveur echoue sur un BOM et retombe silencieusement sur les valeurs par defaut.
+        raise ValueError(f"BOM UTF-8 detecte dans {path}: le serveur ne pourra pas le lire")
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as error:
+        return json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
         raise ValueError(f"JSON invalide dans {path}: {error}") from error
 
 
-def validate_types(types: Dict[str, Dict[str, Any]], *, check_media: bool) -> List[str]:
+def validate_types(
+    types: Dict[str, Dict[str, Any]],
+    *,
+    check_media: bool,
+    only: Optional[AbstractSet[str]] = None,
+    known_media: AbstractSet[str] = frozenset(),
+) -> List[str]:
     issues: List[str] = []
     for type_name, payload in types.items():
+        if only is not None and type_name not in only:
+            continue
         icon = payload.get("icon")
         zoom = payload.get("zoom")
         if not isinstance(icon, str) or not icon:
             issues.append(f"Type '{type_name}': champ 'icon' manquant ou invalide")
-        elif check_media:
+        elif check_media and icon not in known_media:
             icon_path = ROOT / icon
             if not icon_path.exists():
                 issues.append(f"Type '{type_name}': icone introuvable ({icon})")
@@ -52,7 +80,19 @@ def validate_media(path: Path) -> bool:
     return path.exists() and path.is_file()
 
 
-def validate_locations(dataset: Dict[str, Any], types: Dict[str, Any], *, check_media: bool) -> Tuple[List[str], List[str]]:
+def validate_locations(
+    dataset: Dict[str, Any],
+    types: Dict[str, Any],
+    *,
+    check_media: bool,
+    only: Optional[AbstractSet[Tuple[str, str]]] = None,
+    known_media: AbstractSet[str] = frozenset(),
+) -> Tuple[List[str], List[str]]:
+    """Valide les lieux ; `only` restreint les controles par entree a des couples (continent, nom).
+
+    Les doublons de noms restent verifies sur l'ensemble du jeu de donnees, et les medias
+    presents dans `known_media` ne sont pas re-verifies sur disque.
+    """
     issues: List[str] = []
     warnings: List[str] = []
     seen_names: Dict[str, str] = {}
@@ -75,6 +115,8 @@ def validate_locations(dataset: Dict[str, Any], types: Dict[str, Any], *, check_
                 issues.append(f"Doublon de nom '{name}' (deja vu dans {seen_names[name]})")
             else:
                 seen_names[name] = f"{continent}[{index}]"
+            if only is not None and (continent, name) not in only:
+                continue
 
             loc_type = (entry.get("type") or "default").strip()
             if loc_type != "default" and loc_type not in types:
@@ -89,7 +131,7 @@ def validate_locations(dataset: Dict[str, Any], types: Dict[str, Any], *, check_
             if audio_path:
                 if not isinstance(audio_path, str):
                     issues.append(f"{name}: champ audio doit etre une chaine")
-                elif check_media:
+                elif check_media and audio_path not in known_media:
                     resolved = normalize_media_path(audio_path)
                     if not resolved or not validate_media(resolved):
                         issues.append(f"{name}: fichier audio introuvable ({audio_path})")
@@ -122,7 +164,7 @@ def validate_locations(dataset: Dict[str, Any], types: Dict[str, Any], *, check_
                     if not isinstance(image, str):
                         issues.append(f"{name}: entree image non valide ({image!r})")
                         continue
-                    if check_media:
+                    if check_media and image not in known_media:
                         resolved = normalize_media_path(image)
                         if not resolved or not validate_media(resolved):
                             issues.append(f"{name}: image introuvable ({image})")
@@ -200,6 +242,303 @@ def validate_locations(dataset: Dict[str, Any], types: Dict[str, Any], *, check_
     return issues, warnings
 
 
+def normalize_lookup_key(value: Any) -> str:
+    """Reproduit normalizeTimelineText (infoPanel.js) : sans accents, minuscules."""
+    decomposed = unicodedata.normalize("NFD", str(value or ""))
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower().strip()
+
+
+def is_http_url(value: str) -> bool:
+    return bool(re.match(r"^https?://[^\s/]+", value, re.IGNORECASE))
+
+
+def is_iso_date(value: str) -> bool:
+    try:
+        datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return True
+
+
+def check_text(issues: List[str], warnings: List[str], label: str, value: Any, max_length: int, *, required: bool = False) -> None:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            issues.append(f"{label}: champ manquant ou vide")
+        return
+    if not isinstance(value, str):
+        issues.append(f"{label}: doit etre une chaine (actuel: {value!r})")
+    elif len(value.strip()) > max_length:
+        warnings.append(f"{label}: {len(value.strip())} caracteres, tronque a {max_length} par le serveur")
+
+
+def check_site_url(
+    issues: List[str],
+    warnings: List[str],
+    label: str,
+    value: Any,
+    *,
+    allow_relative: bool = False,
+    check_media: bool = False,
+) -> None:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return
+    if not isinstance(value, str):
+        issues.append(f"{label}: URL invalide ({value!r})")
+        return
+    url = value.strip()
+    if allow_relative and url.startswith("/"):
+        if check_media and url.startswith("/assets/"):
+            resolved = normalize_media_path(url.lstrip("/"))
+            if not resolved or not validate_media(resolved):
+                warnings.append(f"{label}: fichier introuvable ({url})")
+        return
+    if not is_http_url(url):
+        issues.append(f"{label}: URL rejetee par le serveur ({url})")
+
+
+def validate_timeline(timeline: Any, *, check_media: bool) -> Tuple[List[str], List[str]]:
+    issues: List[str] = []
+    warnings: List[str] = []
+    if not isinstance(timeline, dict):
+        return ["Timeline: structure attendue = objet"], warnings
+    check_text(issues, warnings, "Timeline: title", timeline.get("title"), 120)
+    check_text(issues, warnings, "Timeline: subtitle", timeline.get("subtitle"), 320)
+    entries = timeline.get("entries")
+    if not isinstance(entries, list):
+        issues.append("Timeline: champ entries doit etre une liste")
+        return issues, warnings
+    if len(entries) > TIMELINE_MAX_ENTRIES:
+        warnings.append(f"Timeline: {len(entries)} entrees, seules les {TIMELINE_MAX_ENTRIES} premieres sont conservees")
+
+    seen_ids: Dict[str, int] = {}
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            issues.append(f"Timeline[{index}]: entree non objet JSON")
+            continue
+        entry_id = entry.get("id")
+        label = f"Timeline[{index}]"
+        if not isinstance(entry_id, str) or not entry_id.strip():
+            warnings.append(f"{label}: id absent, il sera genere par le serveur")
+        else:
+            label = f"Timeline '{entry_id}'"
+            if not re.match(r"^[a-z0-9_-]{1,80}$", entry_id):
+                issues.append(f"{label}: id non normalise (attendu: minuscules, chiffres, '-' ou '_')")
+            if entry_id in seen_ids:
+                issues.append(f"{label}: id en doublon (deja vu a l'index {seen_ids[entry_id]})")
+            else:
+                seen_ids[entry_id] = index
+
+        year = entry.get("year")
+        if isinstance(year, bool) or not isinstance(year, (int, float)):
+            issues.append(f"{label}: champ 'year' doit etre numerique (actuel: {year!r})")
+        check_text(issues, warnings, f"{label}: title", entry.get("title"), 140, required=True)
+        check_text(issues, warnings, f"{label}: summary", entry.get("summary"), 280)
+        check_text(issues, warnings, f"{label}: content", entry.get("content"), 2400)
+        check_text(issues, warnings, f"{label}: yearLabel", entry.get("yearLabel"), 40)
+        check_text(issues, warnings, f"{label}: era", entry.get("era"), 80)
+        check_text(issues, warnings, f"{label}: period", entry.get("period"), 80)
+        check_text(issues, warnings, f"{label}: mediaAlt", entry.get("mediaAlt"), 180)
+
+        event_kind = entry.get("eventKind")
+        if event_kind is not None and event_kind not in ("lore", "player"):
+            issues.append(f"{label}: eventKind inconnu ({event_kind!r})")
+        color = entry.get("accentColor")
+        if color is not None and (not isinstance(color, str) or not HEX_COLOR_PATTERN.match(color.strip())):
+            issues.append(f"{label}: accentColor invalide ({color!r})")
+        visible = entry.get("visible")
+        if visible is not None and not isinstance(visible, bool):
+            issues.append(f"{label}: champ visible doit etre un booleen")
+        for list_key, max_items in (("tags", 10), ("locationNames", 10)):
+            values = entry.get(list_key)
+            if values is None:
+                continue
+            if not isinstance(values, list):
+                issues.append(f"{label}: champ {list_key} doit etre une liste")
+                continue
+            for value_index, value in enumerate(values):
+                if not isinstance(value, str) or not value.strip():
+                    issues.append(f"{label}: {list_key}[{value_index}] invalide ({value!r})")
+            if len(values) > max_items:
+                warnings.append(f"{label}: {list_key} limite a {max_items} elements par le serveur")
+        check_site_url(
+            issues, warnings, f"{label}: imageUrl", entry.get("imageUrl"),
+            allow_relative=True, check_media=check_media,
+        )
+    return issues, warnings
+
+
+def validate_site_config(config: Any, *, check_media: bool) -> Tuple[List[str], List[str]]:
+    issues: List[str] = []
+    warnings: List[str] = []
+    if not isinstance(config, dict):
+        return ["Site config: structure attendue = objet"], warnings
+
+    sections: Dict[str, Dict[str, Any]] = {}
+    for section in ("home", "community", "support", "legal"):
+        payload = config.get(section)
+        if payload is None:
+            warnings.append(f"Site config: section '{section}' absente, valeurs par defaut utilisees")
+            payload = {}
+        elif not isinstance(payload, dict):
+            issues.append(f"Site config: section '{section}' doit etre un objet")
+            payload = {}
+        sections[section] = payload
+
+    home = sections["home"]
+    for key, max_length in (("kicker", 80), ("title", 180), ("lead", 600), ("atmosphere", 180)):
+        check_text(issues, warnings, f"Site config: home.{key}", home.get(key), max_length)
+    metrics = home.get("metrics")
+    if metrics is not None:
+        if not isinstance(metrics, list):
+            issues.append("Site config: home.metrics doit etre une liste")
+        else:
+            for index, metric in enumerate(metrics):
+                if not isinstance(metric, dict) or not metric.get("label") or not metric.get("value"):
+                    issues.append(f"Site config: home.metrics[{index}] doit contenir label et value")
+    visuals = home.get("visuals") or {}
+    if isinstance(visuals, dict):
+        for key in ("backgroundImage", "mapPreviewImage", "characterImage"):
+            check_site_url(
+                issues, warnings, f"Site config: home.visuals.{key}", visuals.get(key),
+                allow_relative=True, check_media=check_media,
+            )
+    else:
+        issues.append("Site config: home.visuals doit etre un objet")
+
+    community = sections["community"]
+    for key in ("youtubeUrl", "discordUrl", "redditUrl"):
+        check_site_url(issues, warnings, f"Site config: community.{key}", community.get(key))
+    support = sections["support"]
+    check_site_url(issues, warnings, "Site config: support.issuesUrl", support.get("issuesUrl"))
+    contact = support.get("contactEmail")
+    if contact and (not isinstance(contact, str) or not EMAIL_PATTERN.match(contact.strip())):
+        issues.append(f"Site config: support.contactEmail invalide ({contact!r})")
+    legal = sections["legal"]
+    check_site_url(
+        issues, warnings, "Site config: legal.creditsUrl", legal.get("creditsUrl"),
+        allow_relative=True, check_media=False,
+    )
+
+    changelog = config.get("changelog")
+    if changelog is not None:
+        if not isinstance(changelog, list):
+            issues.append("Site config: changelog doit etre une liste")
+        else:
+            for index, entry in enumerate(changelog):
+                if not isinstance(entry, dict):
+                    issues.append(f"Site config: changelog[{index}] non objet JSON")
+                    continue
+                date = entry.get("date")
+                if date and (not isinstance(date, str) or not is_iso_date(date)):
+                    warnings.append(f"Site config: changelog[{index}] date non reconnue ({date!r})")
+                if not any(entry.get(key) for key in ("date", "title", "summary")):
+                    issues.append(f"Site config: changelog[{index}] vide, ignore par le serveur")
+    return issues, warnings
+
+
+def validate_users(users: Any, *, check_media: bool) -> Tuple[List[str], List[str]]:
+    issues: List[str] = []
+    warnings: List[str] = []
+    if not isinstance(users, list):
+        return ["Utilisateurs: structure attendue = liste"], warnings
+    seen_ids: Dict[str, int] = {}
+    for index, user in enumerate(users):
+        if not isinstance(user, dict):
+            issues.append(f"Utilisateurs[{index}]: entree non objet JSON")
+            continue
+        user_id = user.get("id")
+        if not isinstance(user_id, str) or not user_id.strip():
+            issues.append(f"Utilisateurs[{index}]: id manquant")
+            continue
+        label = f"Utilisateur '{user_id}'"
+        if user_id in seen_ids:
+            issues.append(f"{label}: id en doublon (deja vu a l'index {seen_ids[user_id]})")
+        else:
+            seen_ids[user_id] = index
+        role = user.get("role")
+        if role is not None and (not isinstance(role, str) or role.lower() not in ("admin", "user")):
+            issues.append(f"{label}: role inconnu ({role!r})")
+        if user.get("provider") == "discord" and not user.get("discordId"):
+            issues.append(f"{label}: discordId manquant pour un compte discord")
+        groups = user.get("groups")
+        if groups is not None and (not isinstance(groups, list) or not all(isinstance(group, str) for group in groups)):
+            issues.append(f"{label}: champ groups doit etre une liste de chaines")
+        characters = user.get("characters")
+        if characters is not None and not isinstance(characters, list):
+            issues.append(f"{label}: champ characters doit etre une liste")
+        for key in ("lastLoginAt", "lastSeenAt"):
+            value = user.get(key)
+            if value is not None and (not isinstance(value, str) or not is_iso_date(value)):
+                warnings.append(f"{label}: {key} n'est pas une date ISO ({value!r})")
+    return issues, warnings
+
+
+def validate_groups(groups: Any, *, check_media: bool) -> Tuple[List[str], List[str]]:
+    issues: List[str] = []
+    warnings: List[str] = []
+    if isinstance(groups, dict) and isinstance(groups.get("groups"), list):
+        groups = groups["groups"]
+    if not isinstance(groups, list):
+        return ["Groupes: structure attendue = liste"], warnings
+    seen_ids: Dict[str, int] = {}
+    for index, group in enumerate(groups):
+        if not isinstance(group, dict):
+            issues.append(f"Groupes[{index}]: entree non objet JSON")
+            continue
+        group_id = group.get("id")
+        if not isinstance(group_id, str) or not group_id.strip():
+            issues.append(f"Groupes[{index}]: id manquant")
+            continue
+        label = f"Groupe '{group_id}'"
+        if group_id in seen_ids:
+            issues.append(f"{label}: id en doublon (deja vu a l'index {seen_ids[group_id]})")
+        else:
+            seen_ids[group_id] = index
+        if not isinstance(group.get("name"), str) or not group["name"].strip():
+            issues.append(f"{label}: nom manquant")
+        color = group.get("color")
+        if color is not None and (not isinstance(color, str) or not GROUP_COLOR_PATTERN.match(color.strip())):
+            warnings.append(f"{label}: couleur invalide ({color!r}), ignoree par le serveur")
+        for coord_key in ("x", "y"):
+            value = group.get(coord_key)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                issues.append(f"{label}: coordonnee '{coord_key}' invalide ({value!r})")
+        members = group.get("members")
+        if members is not None and not isinstance(members, list):
+            issues.append(f"{label}: champ members doit etre une liste")
+    return issues, warnings
+
+
+def validate_annotations(annotations: Any, *, check_media: bool) -> Tuple[List[str], List[str]]:
+    issues: List[str] = []
+    warnings: List[str] = []
+    if not isinstance(annotations, list):
+        return ["Annotations: structure attendue = liste"], warnings
+    seen_ids: Dict[str, int] = {}
+    for index, annotation in enumerate(annotations):
+        if not isinstance(annotation, dict):
+            issues.append(f"Annotations[{index}]: entree non objet JSON")
+            continue
+        annotation_id = annotation.get("id")
+        label = f"Annotation '{annotation_id}'" if annotation_id else f"Annotations[{index}]"
+        if not isinstance(annotation_id, str) or not annotation_id.strip():
+            issues.append(f"{label}: id manquant, la carte ignorera ce marqueur")
+        elif annotation_id in seen_ids:
+            issues.append(f"{label}: id en doublon (deja vu a l'index {seen_ids[annotation_id]})")
+        else:
+            seen_ids[annotation_id] = index
+        for coord_key in ("x", "y"):
+            value = annotation.get(coord_key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                issues.append(f"{label}: coordonnee '{coord_key}' invalide ({value!r})")
+        if not isinstance(annotation.get("label"), str) or not annotation["label"].strip():
+            issues.append(f"{label}: label manquant")
+        expires_at = annotation.get("expiresAt")
+        if expires_at is not None and (not isinstance(expires_at, str) or not is_iso_date(expires_at)):
+            issues.append(f"{label}: expiresAt n'est pas une date ISO ({expires_at!r})")
+    return issues, warnings
+
+
 def collect_media(dataset: Dict[str, Any]) -> Iterable[str]:
     for raw_locations in dataset.values():
         if not isinstance(raw_locations, list):
@@ -222,9 +561,23 @@ def collect_registered_media(types: Dict[str, Any]) -> Iterable[str]:
             yield icon
 
 
-def detect_unused_media(dataset: Dict[str, Any], types: Dict[str, Any]) -> List[str]:
+def collect_document_media(timeline: Any, site_config: Any) -> Iterable[str]:
+    if isinstance(timeline, dict) and isinstance(timeline.get("entries"), list):
+        for entry in timeline["entries"]:
+            if isinstance(entry, dict) and isinstance(entry.get("imageUrl"), str):
+                yield entry["imageUrl"].lstrip("/")
+    home = site_config.get("home") if isinstance(site_config, dict) else None
+    visuals = home.get("visuals") if isinstance(home, dict) else None
+    if isinstance(visuals, dict):
+        for value in visuals.values():
+            if isinstance(value, str) and value.startswith("/assets/"):
+                yield value.lstrip("/")
+
+
+def detect_unused_media(dataset: Dict[str, Any], types: Dict[str, Any], extra: Iterable[str] = ()) -> List[str]:
     declared = {Path(path).as_posix() for path in collect_media(dataset)}
     declared.update(Path(path).as_posix() for path in collect_registered_media(types))
+    declared.update(Path(path).as_posix() for path in extra)
     existing = {
         path.relative_to(ROOT).as_posix()
         for path in ASSETS_DIR.rglob("*")
@@ -234,6 +587,301 @@ def detect_unused_media(dataset: Dict[str, Any], types: Dict[str, Any]) -> List[
     return [f"Media non référencé : {path}" for path in unused if not path.endswith(".json")]
 
 
+# Documents secondaires : (validateur, libelle). Un fichier absent n'est qu'un avertissement,
+# le serveur retombant alors sur ses valeurs par defaut.
+DOCUMENT_VALIDATORS: Dict[str, Tuple[Callable[..., Tuple[List[str], List[str]]], str]] = {
+    "timeline": (validate_timeline, "Timeline"),
+    "site_config": (validate_site_config, "Site config"),
+    "users": (validate_users, "Utilisateurs"),
+    "groups": (validate_groups, "Groupes"),
+    "annotations": (validate_annotations, "Annotations"),
+}
+
+
+def run_document(
+    kind: str,
+    path: Path,
+    types: Dict[str, Any],
+    check_media: bool,
+    changes: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Charge et valide un document de facon autonome (eventuellement dans un processus du pool).
+
+    `types` est le contenu deja charge de types.json. `changes` provient de `collect_changes` : seules les entrees modifiees sont alors revalidees.
+    """
+    report: Dict[str, Any] = {"kind": kind, "data": None, "issues": [], "warnings": []}
+    scope: Dict[str, Any] = {}
+    if changes is not None:
+        scope["known_media"] = changes["known_media"]
+    if kind == "types":
+        report["data"] = types
+        if changes is not None:
+            scope["only"] = changes["types"]
+        report["issues"] = validate_types(report["data"], check_media=check_media, **scope)
+        return report
+    if kind == "locations":
+        report["data"] = load_json(path)
+        if changes is not None:
+            scope["only"] = changes["locations"]
+        issues, warnings = validate_locations(report["data"], types, check_media=check_media, **scope)
+        report["issues"], report["warnings"] = issues, warnings
+        return report
+
+    validator, label = DOCUMENT_VALIDATORS[kind]
+    try:
+        report["data"] = load_json(path)
+    except FileNotFoundError:
+        report["warnings"].append(f"{label}: fichier absent ({path}), valeurs par defaut du serveur")
+        return report
+    except ValueError as error:
+        report["issues"].append(f"{label}: {error}")
+        return report
+    if changes is not None and kind in changes["unchanged"]:
+        return report
+    report["issues"], report["warnings"] = validator(report["data"], check_media=check_media)
+    return report
+
+
+def validate_cross_references(documents: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    issues: List[str] = []
+    warnings: List[str] = []
+    locations = documents.get("locations") or {}
+    known_places = {normalize_lookup_key(continent) for continent in locations}
+    for raw_locations in locations.values():
+        if isinstance(raw_locations, list):
+            known_places.update(
+                normalize_lookup_key(entry.get("name"))
+                for entry in raw_locations
+                if isinstance(entry, dict) and entry.get("name")
+            )
+
+    timeline = documents.get("timeline")
+    if isinstance(timeline, dict) and isinstance(timeline.get("entries"), list):
+        for index, entry in enumerate(timeline["entries"]):
+            if not isinstance(entry, dict) or not isinstance(entry.get("locationNames"), list):
+                continue
+            label = f"Timeline '{entry.get('id') or index}'"
+            for location_name in entry["locationNames"]:
+                if isinstance(location_name, str) and normalize_lookup_key(location_name) not in known_places:
+                    issues.append(f"{label}: lieu inconnu '{location_name}'")
+
+    annotations = documents.get("annotations")
+    if isinstance(annotations, list):
+        for index, annotation in enumerate(annotations):
+            if not isinstance(annotation, dict):
+                continue
+            location_name = annotation.get("locationName")
+            if isinstance(location_name, str) and location_name.strip():
+                if normalize_lookup_key(location_name) not in known_places:
+                    label = f"Annotation '{annotation.get('id') or index}'"
+                    issues.append(f"{label}: lieu inconnu '{location_name}'")
+
+    users = documents.get("users")
+    users = users if isinstance(users, list) else []
+    groups = documents.get("groups")
+    if isinstance(groups, dict):
+        groups = groups.get("groups")
+    groups = groups if isinstance(groups, list) else []
+    users = [user for user in users if isinstance(user, dict) and isinstance(user.get("id"), str) and user["id"]]
+    groups = [group for group in groups if isinstance(group, dict) and isinstance(group.get("id"), str) and group["id"]]
+    user_ids = {user["id"] for user in users}
+    group_ids = {group["id"] for group in groups}
+
+    for group in groups:
+        if not isinstance(group.get("members"), list):
+            continue
+        for member in group["members"]:
+            if isinstance(member, str) and member not in user_ids:
+                issues.append(f"Groupe '{group['id']}': membre inconnu '{member}'")
+    for user in users:
+        label = f"Utilisateur '{user['id']}'"
+        user_groups = user.get("groups") if isinstance(user.get("groups"), list) else []
+        for group_id in user_groups:
+            if isinstance(group_id, str) and group_id not in group_ids:
+                issues.append(f"{label}: groupe inconnu '{group_id}'")
+        characters = user.get("characters") if isinstance(user.get("characters"), list) else []
+        for character in characters:
+            if not isinstance(character, dict):
+                continue
+            group_id = character.get("groupId") or character.get("group")
+            if isinstance(group_id, str) and group_id.strip() and group_id not in group_ids:
+                name = character.get("name") or character.get("id") or "?"
+                warnings.append(f"{label}: personnage '{name}' rattache a un groupe inconnu '{group_id}'")
+    return issues, warnings
+
+
+def run_git(*args: str) -> str:
+    try:
+        completed = subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, check=True, text=True, encoding="utf-8"
+        )
+    except FileNotFoundError as error:
+        raise ValueError("git introuvable, le mode --since est indisponible") from error
+    except subprocess.CalledProcessError as error:
+        raise ValueError(f"git {' '.join(args)} a echoue : {error.stderr.strip()}") from error
+    return completed.stdout
+
+
+def repo_relative(path: Path) -> Optional[str]:
+    try:
+        return path.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return None
+
+
+def load_revision_json(rev: str, relative: str) -> Any:
+    try:
+        return json.loads(run_git("show", f"{rev}:{relative}").lstrip("\ufeff"))
+    except ValueError:
+        return None
+
+
+def diff_locations(old: Any, new: Any, changed_types: AbstractSet[str]) -> Set[Tuple[str, str]]:
+    """Couples (continent, nom) ajoutes, modifies ou dont le type a change depuis la revision."""
+    def index(dataset: Any) -> Dict[Tuple[str, str], str]:
+        entries: Dict[Tuple[str, str], str] = {}
+        if not isinstance(dataset, dict):
+            return entries
+        for continent, raw_locations in dataset.items():
+            if not isinstance(raw_locations, list):
+                continue
+            for entry in raw_locations:
+                if isinstance(entry, dict) and isinstance(entry.get("name"), str):
+                    key = (continent, entry["name"].strip())
+                    entries[key] = json.dumps(entry, sort_keys=True, ensure_ascii=False)
+        return entries
+
+    previous = index(old)
+    changed = {key for key, payload in index(new).items() if previous.get(key) != payload}
+    if changed_types and isinstance(new, dict):
+        for continent, raw_locations in new.items():
+            for entry in raw_locations if isinstance(raw_locations, list) else []:
+                if isinstance(entry, dict) and isinstance(entry.get("name"), str):
+                    if (entry.get("type") or "default").strip() in changed_types:
+                        changed.add((continent, entry["name"].strip()))
+    return changed
+
+
+def collect_changes(rev: str, paths: Dict[str, Path]) -> Dict[str, Any]:
+    """Compare les blobs git de chaque document a `rev` pour limiter la validation au diff.
+
+    Un document dont le blob est identique n'est pas revalide ; pour locations.json et
+    types.json, seules les entrees dont le contenu differe le sont. Les medias deja
+    references a `rev` et non modifies depuis ne sont pas re-verifies sur disque.
+    """
+    try:
+        run_git("rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}")
+    except ValueError as error:
+        raise ValueError(f"Revision git inconnue : {rev}") from error
+    relatives = {kind: repo_relative(path) for kind, path in paths.items()}
+    tracked = [relative for relative in relatives.values() if relative]
+
+    base_blobs: Dict[str, str] = {}
+    for record in run_git("ls-tree", "-z", rev, "--", *tracked).split("\0"):
+        if record:
+            meta, relative = record.split("\t", 1)
+            base_blobs[relative] = meta.split()[2]
+    existing = [relative for relative in tracked if (ROOT / relative).is_file()]
+    current_blobs = dict(zip(existing, run_git("hash-object", "--", *existing).split())) if existing else {}
+
+    unchanged = {
+        kind for kind, relative in relatives.items()
+        if relative and relative in base_blobs and base_blobs[relative] == current_blobs.get(relative)
+    }
+
+    def base_document(kind: str) -> Dict[str, Any]:
+        relative = relatives[kind]
+        if relative not in base_blobs:
+            return {}
+        document = load_revision_json(rev, relative)
+        return document if isinstance(document, dict) else {}
+
+    new_types = load_json(paths["types"])
+    new_locations = load_json(paths["locations"])
+    old_types = new_types if "types" in unchanged else base_document("types")
+    old_locations = new_locations if "locations" in unchanged else base_document("locations")
+    changed_types = {
+        name for name in set(old_types) | set(new_types)
+        if old_types.get(name) != new_types.get(name)
+    }
+    changed_locations = diff_locations(old_locations, new_locations, changed_types)
+
+    # Un media supprime ou renomme sans modification du JSON doit tout de meme etre revalide.
+    diff = run_git("diff", "--name-only", "-z", "--no-renames", rev, "--", ASSETS_DIR.relative_to(ROOT).as_posix())
+    touched = {path for path in diff.split("\0") if path}
+    for continent, raw_locations in new_locations.items() if isinstance(new_locations, dict) else []:
+        for entry in raw_locations if isinstance(raw_locations, list) else []:
+            if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+                continue
+            references = {Path(path).as_posix() for path in collect_media({continent: [entry]})}
+            if references & touched:
+                changed_locations.add((continent, entry["name"].strip()))
+    for name, payload in new_types.items() if isinstance(new_types, dict) else []:
+        icon = payload.get("icon") if isinstance(payload, dict) else None
+        if isinstance(icon, str) and Path(icon).as_posix() in touched:
+            changed_types.add(name)
+    for kind in ("timeline", "site_config"):
+        if kind not in unchanged:
+            continue
+        try:
+            document = load_json(paths[kind])
+        except (FileNotFoundError, ValueError):
+            continue
+        media = collect_document_media(document, None) if kind == "timeline" else collect_document_media(None, document)
+        if {Path(path).as_posix() for path in media} & touched:
+            unchanged.discard(kind)
+
+    known_media = {Path(path).as_posix() for path in collect_media(old_locations)}
+    known_media.update(Path(path).as_posix() for path in collect_registered_media(old_types))
+    known_media.difference_update(touched)
+
+    return {
+        "unchanged": unchanged,
+        "locations": changed_locations,
+        "types": changed_types,
+        "known_media": known_media,
+    }
+
+
+def run_pipeline(
+    paths: Dict[str, Path],
+    *,
+    check_media: bool,
+    jobs: Optional[int] = None,
+    changes: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """Valide chaque document puis fusionne les rapports dans l'ordre de `paths`.
+
+    Sans `jobs`, la validation reste dans le processus courant tant que les documents sont
+    petits : demarrer un pool coute alors plus cher que la validation elle-meme.
+    """
+    types = load_json(paths["types"])
+    tasks = [(kind, path, types, check_media, changes) for kind, path in paths.items()]
+    if jobs is None:
+        total_size = sum(path.stat().st_size for path in paths.values() if path.is_file())
+        use_pool = total_size >= PARALLEL_MIN_BYTES
+    else:
+        use_pool = jobs > 1
+    if not use_pool:
+        reports = [run_document(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(run_document, *task) for task in tasks]
+            reports = [future.result() for future in futures]
+
+    documents: Dict[str, Any] = {}
+    issues: List[str] = []
+    warnings: List[str] = []
+    for report in reports:
+        documents[report["kind"]] = report["data"]
+        issues.extend(report["issues"])
+        warnings.extend(report["warnings"])
+    cross_issues, cross_warnings = validate_cross_references(documents)
+    issues.extend(cross_issues)
+    warnings.extend(cross_warnings)
+    return documents, issues, warnings
+
+
 def main() -> int:
     try:
         sys.stdout.reconfigure(encoding="utf-8")
@@ -243,21 +891,43 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Validation des ressources de la carte interactive")
     parser.add_argument("--locations", type=Path, default=LOCATIONS_PATH, help="Chemin du fichier locations.json")
     parser.add_argument("--types", type=Path, default=TYPES_PATH, help="Chemin du fichier types.json")
+    parser.add_argument("--timeline", type=Path, default=TIMELINE_PATH, help="Chemin du fichier timeline.json")
+    parser.add_argument("--site-config", type=Path, default=SITE_CONFIG_PATH, help="Chemin du fichier site-config.json")
+    parser.add_argument("--users", type=Path, default=USERS_PATH, help="Chemin du fichier users.json")
+    parser.add_argument("--groups", type=Path, default=GROUPS_PATH, help="Chemin du fichier groups.json")
+    parser.add_argument("--annotations", type=Path, default=ANNOTATIONS_PATH, help="Chemin du fichier annotations.json")
+    parser.add_argument("--jobs", type=int, default=None, help="Nombre de processus de validation (par defaut : sequentiel sauf gros documents)")
     parser.add_argument("--no-files", action="store_true", help="Ignore la verification de presence des fichiers medias")
+    parser.add_argument(
+        "--since",
+        metavar="REV",
+        help="Ne revalide que les documents et entrees modifies depuis la revision git REV",
+    )
     args = parser.parse_args()
 
-    types_data = load_json(args.types)
-    locations_data = load_json(args.locations)
-
     check_media = not args.no_files
-    issues: List[str] = []
-    warnings: List[str] = []
-    issues.extend(validate_types(types_data, check_media=check_media))
-    location_errors, location_warnings = validate_locations(locations_data, types_data, check_media=check_media)
-    issues.extend(location_errors)
-    warnings.extend(location_warnings)
-    if check_media:
-        warnings.extend(detect_unused_media(locations_data, types_data))
+    paths = {
+        "types": args.types,
+        "locations": args.locations,
+        "timeline": args.timeline,
+        "site_config": args.site_config,
+        "users": args.users,
+        "groups": args.groups,
+        "annotations": args.annotations,
+    }
+    changes = None
+    if args.since:
+        try:
+            changes = collect_changes(args.since, paths)
+        except ValueError as error:
+            print(f"[ERREUR] {error}")
+            return 1
+    documents, issues, warnings = run_pipeline(paths, check_media=check_media, jobs=args.jobs, changes=changes)
+    types_data = documents["types"]
+    locations_data = documents["locations"]
+    if check_media and changes is None:
+        extra_media = collect_document_media(documents.get("timeline"), documents.get("site_config"))
+        warnings.extend(detect_unused_media(locations_data, types_data, extra_media))
 
     if issues:
         print("\n[ERREUR] Problemes detectes :")
@@ -272,7 +942,20 @@ def main() -> int:
             print(f" - {entry}")
 
     total_locations = sum(len(v) for v in locations_data.values() if isinstance(v, list))
-    print(f"\nResume : {len(types_data)} types, {total_locations} lieux analyses.")
+    timeline = documents.get("timeline")
+    total_events = len(timeline.get("entries") or []) if isinstance(timeline, dict) else 0
+    users = documents.get("users")
+    total_users = len(users) if isinstance(users, list) else 0
+    print(
+        f"\nResume : {len(types_data)} types, {total_locations} lieux, "
+        f"{total_events} evenements, {total_users} utilisateurs analyses."
+    )
+    if changes is not None:
+        print(
+            f"Mode --since {args.since} : {len(changes['locations'])} lieux et "
+            f"{len(changes['types'])} types revalides, "
+            f"{len(paths) - len(changes['unchanged'])} documents modifies."
+        )
     if issues and check_media:
         missing_files = [msg for msg in issues if "introuvable" in msg]
         if missing_files: